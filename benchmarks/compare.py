@@ -0,0 +1,46 @@
+"""
+    Сравнение двух JSON-результатов бенчмарков (базовая линия и новый прогон).
+
+    Метрики *_ms считаются тем лучше, чем меньше; rps и ops_per_s - чем больше.
+    Код возврата 1, если хоть одна метрика ухудшилась больше порога.
+
+    Пример:
+        python -m benchmarks.compare base.json new.json --threshold 0.1
+"""
+import argparse
+import json
+import sys
+
+HIGHER_IS_BETTER = ("rps", "ops_per_s")
+
+
+def compare(base: dict, new: dict, threshold: float) -> bool:
+    regressed = False
+    for name, new_metrics in new["results"].items():
+        base_metrics = base["results"].get(name)
+        if base_metrics is None:
+            print(f"{name}: нет в базовой линии")
+            continue
+        for metric, new_value in new_metrics.items():
+            if not (metric.endswith("_ms") or metric in HIGHER_IS_BETTER):
+                continue
+            base_value = base_metrics.get(metric)
+            if not base_value:
+                continue
+            change = (new_value - base_value) / base_value
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            marker = "REGRESSION" if worse > threshold else ""
+            regressed = regressed or worse > threshold
+            print(f"{name:24} {metric:10} {base_value:>12} -> {new_value:<12} {change:+7.1%} {marker}")
+    return regressed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение результатов бенчмарков.")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Допустимое ухудшение, доля")
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as base_file, open(args.new, encoding="utf-8") as new_file:
+        sys.exit(1 if compare(json.load(base_file), json.load(new_file), args.threshold) else 0)
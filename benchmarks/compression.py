@@ -0,0 +1,72 @@
+"""
+    Размер на проводе и стоимость CPU сжатия больших списков по уровням.
+
+    Тело - KittyOutList из --size котят. Для каждого кодека и уровня
+    считается сжатие целиком и потоковое (кусками по --partition котят
+    со сбросом после каждого куска, как в CompressionMiddleware).
+
+    Пример:
+        python -m benchmarks.compression --size 20000 --output compression.json
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.micro import sample_kitty
+from benchmarks.results import write_results
+from src.kitty.schemas import KittyOutList
+from src.middleware.compression import BrotliCompressor, GzipCompressor, brotli
+
+
+def codecs() -> Dict[str, Callable[[], object]]:
+    result = {f"gzip-{level}": (lambda level=level: GzipCompressor(level)) for level in range(1, 10)}
+    if brotli is not None:
+        result.update({f"br-{quality}": (lambda quality=quality: BrotliCompressor(quality)) for quality in range(0, 12)})
+    return result
+
+
+def measure(make_compressor: Callable[[], object], chunks: List[bytes], repeat: int) -> dict:
+    compressed = 0
+    started = time.process_time()
+    for _ in range(repeat):
+        compressor = make_compressor()
+        compressed = sum(
+            len(compressor.compress(chunk, final=number == len(chunks) - 1))
+            for number, chunk in enumerate(chunks)
+        )
+    cpu_s = (time.process_time() - started) / repeat
+    raw = sum(len(chunk) for chunk in chunks)
+    return {
+        "bytes": compressed,
+        "ratio": round(raw / compressed, 2),
+        "cpu_ms": round(cpu_s * 1000, 3),
+        "mb_per_s": round(raw / cpu_s / 2 ** 20, 1) if cpu_s else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Размер и стоимость сжатия списков по уровням.")
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--partition", type=int, default=500, help="Котят в одном куске потока")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    kittens = [sample_kitty(number) for number in range(args.size)]
+    body = KittyOutList(kittens=kittens).model_dump_json().encode()
+    stream_chunks = [
+        KittyOutList(kittens=kittens[start:start + args.partition]).model_dump_json().encode()
+        for start in range(0, args.size, args.partition)
+    ]
+
+    results = {"identity": {"bytes": len(body), "ratio": 1.0, "cpu_ms": 0.0, "mb_per_s": 0.0}}
+    for name, make_compressor in codecs().items():
+        results[name] = measure(make_compressor, [body], args.repeat)
+        results[f"{name}-stream"] = measure(make_compressor, stream_chunks, args.repeat)
+
+    write_results(
+        args.output,
+        "compression",
+        {"size": args.size, "partition": args.partition, "repeat": args.repeat, "brotli": brotli is not None},
+        results,
+    )
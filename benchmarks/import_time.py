@@ -0,0 +1,101 @@
+"""
+    Бенчмарк времени импорта приложения (холодный старт main:app).
+
+    Запускает `python -X importtime -c "import main"` в отдельном процессе
+    несколько раз, берет медиану суммарного времени импорта модуля main
+    и проверяет бюджет. Первый запуск прогревочный и не считается: он
+    записывает кэш байткода (__pycache__), как после первого старта
+    приложения, иначе в замер попадает компиляция измененных модулей. Дополнительно проверяет, что тяжелые зависимости
+    (драйвер БД, jose/ecdsa, opentelemetry) не импортируются при старте.
+
+    Пример:
+        python -m benchmarks.import_time --runs 5
+
+    Код возврата 1, если бюджет превышен или тяжелый модуль импортирован.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from benchmarks.results import write_results
+
+LAZY_MODULES = ("jose", "ecdsa", "rsa", "jwt", "cryptography", "asyncpg", "databases", "opentelemetry")
+# Бюджет холодного импорта main, ms: общий для бенчмарка и tests/test_import_time.py.
+# Сейчас медиана около 1000 ms на одном ядре; запас - на шум общих машин
+IMPORT_BUDGET_MS = 1500.0
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Возвращает {модуль: (self_us, cumulative_us)} по выводу -X importtime."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def measure_once(module: str) -> Dict[str, Tuple[int, int]]:
+    # Кэш байткода пишется всегда, даже если окружение его запрещает
+    env = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_median_ms(module: str, runs: int) -> Tuple[float, List[Dict[str, Tuple[int, int]]]]:
+    """Медиана времени импорта module по runs запускам после прогревочного."""
+    measure_once(module)
+    measured = [measure_once(module) for _ in range(runs)]
+    return statistics.median(run[module][1] / 1000 for run in measured), measured
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    median_ms, runs = measure_median_ms(args.module, args.runs)
+    totals_ms = [run[args.module][1] / 1000 for run in runs]
+
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    print(f"Импорт {args.module}: медиана {median_ms:.1f} ms по {args.runs} запускам (бюджет {args.budget_ms:.0f} ms)")
+    print("Самые дорогие модули (self, ms):")
+    for name, (self_us, _) in slowest:
+        print(f"  {self_us / 1000:8.2f}  {name}")
+
+    write_results(
+        args.output,
+        "import_time",
+        {"module": args.module, "runs": args.runs, "budget_ms": args.budget_ms},
+        {args.module: {"median_ms": round(median_ms, 1), "min_ms": round(min(totals_ms), 1)}},
+    )
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in runs[-1]]
+    if eager:
+        print(f"Модули должны импортироваться лениво, но загружены при старте: {', '.join(eager)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"Бюджет превышен: {median_ms:.1f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+    Нагрузочные сценарии по всем роутерам внутри процесса.
+
+    Приложение поднимается целиком (вместе с lifespan) и вызывается через
+    httpx.ASGITransport, без сети и uvicorn. Нужна локальная Postgres из
+    настроек (.env), заполненная benchmarks.seed.
+
+    Пример:
+        python -m benchmarks.seed --reset
+        python -m benchmarks.load --requests 500 --concurrency 20 --output load.json
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+from sqlalchemy import select
+
+from benchmarks.results import latency_stats, write_results
+from benchmarks.seed import SEED_PASSWORD, SEED_USERNAME, WORDS
+from core.session import async_session, get_settings
+from database.models import Breed, Kitty, User
+
+Scenario = Callable[[httpx.AsyncClient, "LoadContext"], Awaitable[httpx.Response]]
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str):
+    def register(func: Scenario) -> Scenario:
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+class LoadContext:
+    """
+        Данные, общие для всех сценариев: id из БД, котята по владельцам,
+        токены пользователей и генератор случайных чисел с фиксированным seed.
+    """
+
+    def __init__(
+            self,
+            rng: random.Random,
+            usernames: List[str],
+            breed_ids: List[int],
+            owned: Dict[str, List[int]],
+    ):
+        self.rng = rng
+        self.usernames = usernames
+        self.breed_ids = breed_ids
+        self.owned = owned
+        self.headers: Dict[str, Dict[str, str]] = {}
+
+    def auth(self) -> Dict[str, str]:
+        return self.rng.choice(list(self.headers.values()))
+
+    def owned_kitty(self) -> Tuple[int, Dict[str, str]]:
+        """Котенок одного из вошедших пользователей и заголовок его владельца."""
+        username = self.rng.choice([name for name in self.headers if self.owned.get(name)])
+        return self.rng.choice(self.owned[username]), self.headers[username]
+
+
+@scenario("login")
+async def login(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.post(
+        "/user/login", json={"username": ctx.rng.choice(ctx.usernames), "password": SEED_PASSWORD}
+    )
+
+
+@scenario("breed_list")
+async def breed_list(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get("/breed/all/", headers=ctx.auth())
+
+
+@scenario("kitty_list")
+async def kitty_list(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get("/kitty/all/", params={"breed_id": ctx.rng.choice(ctx.breed_ids)}, headers=ctx.auth())
+
+
+@scenario("kitty_get")
+async def kitty_get(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    kitty_id, headers = ctx.owned_kitty()
+    return await client.get(f"/kitty/{kitty_id}", headers=headers)
+
+
+@scenario("kitty_search")
+async def kitty_search(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.get(
+        "/kitty/search",
+        params={"q": " ".join(ctx.rng.sample(WORDS, ctx.rng.randint(1, 2)))},
+        headers=ctx.auth(),
+    )
+
+
+@scenario("kitty_create")
+async def kitty_create(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    return await client.post(
+        "/kitty/create/",
+        json={
+            "name": f"load-{ctx.rng.randint(0, 10 ** 9)}",
+            "color": "black",
+            "age": ctx.rng.randint(1, 36),
+            "description": None,
+            "breed_id": ctx.rng.choice(ctx.breed_ids),
+        },
+        headers=ctx.auth(),
+    )
+
+
+@scenario("kitty_update")
+async def kitty_update(client: httpx.AsyncClient, ctx: LoadContext) -> httpx.Response:
+    kitty_id, headers = ctx.owned_kitty()
+    return await client.put(
+        f"/kitty/update/{kitty_id}",
+        json={"name": None, "color": None, "age": ctx.rng.randint(1, 36), "description": None, "breed_id": None},
+        headers=headers,
+    )
+
+
+async def load_context(seed_value: int, sample: int) -> LoadContext:
+    async with async_session() as session:
+        usernames = (await session.scalars(
+            select(User.username).filter(User.username.like(SEED_USERNAME.format("%"))).order_by(User.id)
+        )).all()
+        breed_ids = (await session.scalars(select(Breed.id).order_by(Breed.id))).all()
+        kittens = (await session.execute(
+            select(Kitty.id, User.username)
+            .outerjoin(User, Kitty.owner_id == User.id)
+            .filter(Kitty.deleted_at == None)
+            .order_by(Kitty.id)
+            .limit(sample)
+        )).all()
+    if not usernames or not breed_ids or not kittens:
+        raise RuntimeError("БД пуста, сначала выполните python -m benchmarks.seed")
+    owned: Dict[str, List[int]] = {}
+    for kitty_id, username in kittens:
+        if username is not None:
+            owned.setdefault(username, []).append(kitty_id)
+    return LoadContext(random.Random(seed_value), list(usernames), list(breed_ids), owned)
+
+
+async def run_scenario(
+        client: httpx.AsyncClient, name: str, ctx: LoadContext, requests: int, concurrency: int
+) -> dict:
+    func = SCENARIOS[name]
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await func(client, ctx)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latency_stats(latencies, time.perf_counter() - started, errors)
+
+
+async def run(
+        names: List[str], requests: int, concurrency: int, seed_value: int, sample: int, rate_limit: bool = False
+) -> Dict[str, dict]:
+    # Все запросы идут с одного адреса, поэтому лимиты по IP по умолчанию выключены
+    get_settings().rate_limit_enabled = rate_limit
+    from main import app
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        ctx = await load_context(seed_value, sample)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for username in ctx.usernames[:concurrency]:
+                response = await client.post("/user/login", json={"username": username, "password": SEED_PASSWORD})
+                response.raise_for_status()
+                ctx.headers[username] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            for name in names:
+                results[name] = await run_scenario(client, name, ctx, requests, concurrency)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочные сценарии через ASGITransport.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="По умолчанию все")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sample", type=int, default=10_000, help="Сколько id котят брать для запросов")
+    parser.add_argument("--rate-limit", action="store_true", help="Не выключать ограничение частоты запросов")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    scenario_names = args.scenario or list(SCENARIOS)
+    write_results(
+        args.output,
+        "load",
+        {key: value for key, value in vars(args).items() if key != "output"} | {"scenario": scenario_names},
+        asyncio.run(run(scenario_names, args.requests, args.concurrency, args.seed, args.sample, args.rate_limit)),
+    )
@@ -0,0 +1,136 @@
+"""
+    Микробенчмарки горячих путей без БД: сериализация ответов и токены.
+
+    Пример:
+        python -m benchmarks.micro --output micro.json
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+from benchmarks.results import write_results
+from core.session import get_settings
+from src.breed.schemas import BreedOut
+from src.kitty.schemas import KittyOut, KittyOutList, KittyOutWithBreed
+from src.user.auth import create_access_token, decode_token
+from src.user.keys import KeySet, generate_private_key, public_jwk
+
+BENCHMARKS: Dict[str, Callable[[int], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+def sample_kitty(number: int) -> KittyOut:
+    now = datetime.now()
+    return KittyOut(
+        created_at=now,
+        updated_at=now,
+        deleted_at=None,
+        id=number,
+        name=f"kitty-{number}",
+        color="black",
+        age=number % 36 + 1,
+        description="fluffy playful calm curious",
+        breed_id=number % 50 + 1,
+    )
+
+
+@benchmark("kitty_list_json")
+def kitty_list_json(size: int):
+    payload = KittyOutList(kittens=[sample_kitty(number) for number in range(size)])
+    return payload.model_dump_json
+
+
+@benchmark("kitty_list_build")
+def kitty_list_build(size: int):
+    return lambda: KittyOutList(kittens=[sample_kitty(number) for number in range(size)])
+
+
+@benchmark("kitty_with_breed_json")
+def kitty_with_breed_json(size: int):
+    payload = KittyOutWithBreed(kitty=sample_kitty(1), breed=BreedOut(id=1, name="breed-1", description=None))
+    return payload.model_dump_json
+
+
+@benchmark("token_create")
+def token_create(size: int):
+    settings = get_settings()
+    return lambda: create_access_token(1, settings=settings)
+
+
+@benchmark("token_verify")
+def token_verify(size: int):
+    settings = get_settings()
+    token = create_access_token(1, settings=settings)
+    return lambda: decode_token(token, settings)
+
+
+def _payload() -> dict:
+    return {"exp": datetime.utcnow() + timedelta(days=1), "jti": "benchmark", "user_id": 1}
+
+
+@benchmark("token_verify_hs256_jose")
+def token_verify_hs256_jose(size: int):
+    from jose import jwt
+
+    token = jwt.encode(_payload(), "benchmark-secret", algorithm="HS256")
+    return lambda: jwt.decode(token, "benchmark-secret", algorithms="HS256")
+
+
+def _key_set(algorithm: str) -> KeySet:
+    private_key = generate_private_key(algorithm)
+    return KeySet(algorithm, "bench", private_key, {"keys": [public_jwk(private_key, "bench", algorithm)]})
+
+
+@benchmark("token_verify_eddsa")
+def token_verify_eddsa(size: int):
+    key_set = _key_set("EdDSA")
+    token = key_set.encode(_payload())
+    return lambda: key_set.decode(token)
+
+
+@benchmark("token_verify_es256")
+def token_verify_es256(size: int):
+    key_set = _key_set("ES256")
+    token = key_set.encode(_payload())
+    return lambda: key_set.decode(token)
+
+
+def measure(func: Callable[[], object], min_time: float) -> dict:
+    func()
+    loops = 0
+    started = time.perf_counter()
+    while True:
+        func()
+        loops += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+    return {
+        "loops": loops,
+        "mean_ms": round(elapsed / loops * 1000, 4),
+        "ops_per_s": round(loops / elapsed, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Микробенчмарки сериализации и токенов.")
+    parser.add_argument("--benchmark", action="append", choices=sorted(BENCHMARKS), help="По умолчанию все")
+    parser.add_argument("--size", type=int, default=1000, help="Размер списков для сериализации")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Секунд на один бенчмарк")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    names = args.benchmark or list(BENCHMARKS)
+    write_results(
+        args.output,
+        "micro",
+        {"size": args.size, "min_time": args.min_time, "benchmark": names},
+        {name: measure(BENCHMARKS[name](args.size), args.min_time) for name in names},
+    )
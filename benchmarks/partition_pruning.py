@@ -0,0 +1,104 @@
+"""
+    Проверка отсечения секций kittens (partition pruning) через EXPLAIN.
+
+    Для запросов из роутеров котят строит план и считает, сколько секций
+    kittens в нем участвует. Проверки зависят от kitty_partition_by: при
+    HASH по breed_id отсекаются запросы с breed_id, при RANGE по created_at -
+    запросы с диапазоном created_at внутри месяца. Код возврата 1, если
+    какой-то запрос затронул не одну секцию. Те же проверки выполняются
+    в tests/test_partition_pruning.py.
+
+    Пример:
+        python -m benchmarks.partition_pruning
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta
+from typing import List, Set
+
+from sqlalchemy import select, update, and_, text
+
+from core.session import async_session, get_engine, get_settings
+from database.models import Kitty
+
+
+def _relations(plan: dict) -> Set[str]:
+    relations = {plan["Relation Name"]} if "Relation Name" in plan else set()
+    for child in plan.get("Plans", []):
+        relations |= _relations(child)
+    return relations
+
+
+async def scanned_partitions(session, statement) -> List[str]:
+    sql = statement.compile(get_engine(), compile_kwargs={"literal_binds": True})
+    # Без ANALYZE: UPDATE не выполняется, нужен только план
+    plan = (await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return sorted(name for name in _relations(plan[0]["Plan"]) if name.startswith("kittens_"))
+
+
+def pruning_checks(partition_by: str, now: datetime) -> dict:
+    """
+        Запросы, которые должны затрагивать ровно одну секцию,
+        в том виде, в каком их строят роутеры.
+    """
+    if partition_by == "breed_id":
+        return {
+            "kitty_list_by_breed": select(Kitty).filter(Kitty.deleted_at == None, Kitty.breed_id == 1),
+            "kitty_update_by_pk": (
+                update(Kitty)
+                .where(and_(Kitty.id == 1, Kitty.breed_id == 1))
+                .values(name="pruning")
+            ),
+            "kitty_bulk_by_filter": (
+                update(Kitty)
+                .where(and_(
+                    Kitty.id.in_(
+                        select(Kitty.id)
+                        .filter(and_(Kitty.deleted_at == None, Kitty.breed_id == 1, Kitty.id > 0))
+                        .order_by(Kitty.id)
+                        .limit(get_settings().bulk_chunk_size)
+                        .scalar_subquery()
+                    ),
+                    Kitty.deleted_at == None,
+                    Kitty.breed_id == 1,
+                ))
+                .values(name="pruning")
+            ),
+        }
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return {
+        "kitty_list_created_this_month": select(Kitty).filter(
+            Kitty.deleted_at == None, Kitty.created_at >= month_start, Kitty.created_at < now
+        ),
+        "kitty_update_by_pk": (
+            update(Kitty)
+            .where(and_(Kitty.id == 1, Kitty.created_at == month_start + timedelta(days=1)))
+            .values(name="pruning")
+        ),
+    }
+
+
+async def run() -> bool:
+    failed = False
+    async with async_session() as session:
+        total = len((await session.execute(
+            text("SELECT inhrelid FROM pg_inherits WHERE inhparent = 'kittens'::regclass")
+        )).all())
+        if not total:
+            print("kittens не секционирована: примените миграции")
+            return True
+        for name, statement in pruning_checks(get_settings().kitty_partition_by, datetime.now()).items():
+            partitions = await scanned_partitions(session, statement)
+            ok = len(partitions) == 1
+            failed = failed or not ok
+            print(f"{name:32} {len(partitions)}/{total} {'OK' if ok else 'FAIL'} {', '.join(partitions)}")
+    return failed
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Проверка отсечения секций kittens через EXPLAIN.").parse_args()
+    sys.exit(1 if asyncio.run(run()) else 0)
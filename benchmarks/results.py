@@ -0,0 +1,59 @@
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_stats(latencies_ms: List[float], elapsed_s: float, errors: int = 0) -> Dict[str, float]:
+    return {
+        "count": len(latencies_ms),
+        "errors": errors,
+        "rps": round(len(latencies_ms) / elapsed_s, 2) if elapsed_s else 0.0,
+        "mean_ms": round(sum(latencies_ms) / len(latencies_ms), 3) if latencies_ms else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "max_ms": round(max(latencies_ms), 3) if latencies_ms else 0.0,
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str | None, kind: str, params: dict, results: Dict[str, dict]):
+    """
+        Печатает результаты и, если задан path, сохраняет их в JSON
+        для сравнения с базовой линией (python -m benchmarks.compare).
+    """
+    document = {
+        "kind": kind,
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "params": params,
+        "results": results,
+    }
+    for name, metrics in results.items():
+        print(f"{name:24} " + "  ".join(f"{key}={value}" for key, value in metrics.items()))
+    if path:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(document, file, ensure_ascii=False, indent=2)
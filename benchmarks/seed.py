@@ -0,0 +1,94 @@
+"""
+    Генератор воспроизводимого набора данных для бенчмарков.
+
+    Заполняет БД из настроек (.env) породами, пользователями и котятами,
+    владельцы котят распределены по пользователям случайно. При одинаковом
+    --seed данные одинаковые. Все пользователи получают пароль SEED_PASSWORD.
+
+    Пример:
+        python -m benchmarks.seed --breeds 50 --kittens 100000 --users 100 --reset
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+from typing import List
+
+from sqlalchemy import insert, text
+
+from core.session import async_session, get_engine, get_settings
+from database.models import Breed, Kitty, User
+
+SEED_PASSWORD = "benchmark"
+SEED_USERNAME = "bench_user_{}"
+COLORS = ("black", "white", "ginger", "grey", "tabby", "calico", "cream", "tortoiseshell")
+WORDS = ("fluffy", "playful", "calm", "curious", "sleepy", "loud", "gentle", "shy", "brave", "lazy")
+INSERT_CHUNK = 5000
+
+
+def _chunks(rows: List[dict], size: int = INSERT_CHUNK):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def seed(breeds: int, kittens: int, users: int, seed_value: int = 42, reset: bool = False) -> dict:
+    if get_settings().is_production():
+        raise RuntimeError("Заполнение тестовыми данными запрещено в production")
+
+    rng = random.Random(seed_value)
+    password_hash = hashlib.sha256(SEED_PASSWORD.encode()).hexdigest()
+
+    async with async_session() as session:
+        if reset:
+            await session.execute(text('TRUNCATE kittens, breeds, "user" RESTART IDENTITY CASCADE'))
+
+        breed_ids = []
+        for chunk in _chunks([
+            {"name": f"breed-{number}", "description": " ".join(rng.choices(WORDS, k=6))}
+            for number in range(breeds)
+        ]):
+            breed_ids.extend((await session.scalars(insert(Breed).returning(Breed.id), chunk)).all())
+
+        user_ids = []
+        for chunk in _chunks([
+            {
+                "username": SEED_USERNAME.format(number),
+                "password_hash": password_hash,
+            }
+            for number in range(users)
+        ]):
+            user_ids.extend((await session.scalars(insert(User).returning(User.id), chunk)).all())
+
+        for chunk in _chunks([
+            {
+                "name": f"kitty-{number}",
+                "color": rng.choice(COLORS),
+                "age": rng.randint(1, 36),
+                "description": " ".join(rng.choices(WORDS, k=rng.randint(3, 20))),
+                "breed_id": rng.choice(breed_ids),
+                "owner_id": rng.choice(user_ids),
+            }
+            for number in range(kittens)
+        ]):
+            await session.execute(insert(Kitty), chunk)
+
+        await session.commit()
+
+    return {"breeds": breeds, "kittens": kittens, "users": users, "seed": seed_value}
+
+
+async def _run_cli(args):
+    try:
+        print(await seed(args.breeds, args.kittens, args.users, args.seed, args.reset))
+    finally:
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Заполнение БД воспроизводимыми данными для бенчмарков.")
+    parser.add_argument("--breeds", type=int, default=50)
+    parser.add_argument("--kittens", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Очистить таблицы перед заполнением")
+    asyncio.run(_run_cli(parser.parse_args()))
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Set
+
+from core.session import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class PgListener:
+    """
+        Одно соединение на процесс, подписанное (LISTEN) на каналы Postgres.
+
+        Подписчики получают asyncio.Event, который выставляется при NOTIFY
+        в канал. Если соединиться не удалось, событие просто не придет и
+        подписчики работают по своему таймауту, как при опросе.
+    """
+
+    def __init__(self):
+        self._connection = None
+        self._channels: Set[str] = set()
+        self._events: Dict[str, Set[asyncio.Event]] = {}
+        self._lock = asyncio.Lock()
+
+    async def _listen(self, channel: str):
+        async with self._lock:
+            if self._connection is None or self._connection.is_closed():
+                import asyncpg
+
+                self._connection = await asyncpg.connect(get_settings().database_url)
+                self._channels = set()
+            if channel not in self._channels:
+                await self._connection.add_listener(channel, self._notify)
+                self._channels.add(channel)
+
+    def _notify(self, connection, pid: int, channel: str, payload: str):
+        for event in self._events.get(channel, ()):
+            event.set()
+
+    @asynccontextmanager
+    async def subscription(self, channel: str) -> AsyncIterator[asyncio.Event]:
+        event = asyncio.Event()
+        self._events.setdefault(channel, set()).add(event)
+        try:
+            await self._listen(channel)
+        except Exception:
+            logger.exception("Не удалось подписаться на канал %s", channel)
+        try:
+            yield event
+        finally:
+            self._events[channel].discard(event)
+
+    async def close(self):
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+
+listener = PgListener()
+
+
+async def wait_for_event(event: asyncio.Event, timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
@@ -1,11 +1,12 @@
+from contextlib import asynccontextmanager
 from functools import lru_cache
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator
 
-from databases import Database
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
+from core import tracing
 from core.settings import AppSettings
 
 
@@ -14,29 +15,57 @@ def get_settings():
     return AppSettings()
 
 
-if get_settings().debug:
-    import logging
+@lru_cache()
+def get_engine() -> AsyncEngine:
+    """
+        Движок БД создается при первом обращении, а не при импорте модуля,
+        чтобы импорт приложения не тянул драйвер asyncpg и настройку логов.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    settings = get_settings()
+    if settings.debug:
+        import logging
+
+        logging.basicConfig()
+
+    return create_async_engine(
+        settings.async_database_url(),
+        future=True,
+        echo=settings.debug,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
 
-    logging.basicConfig()
-    logging.getLogger('databases').setLevel(logging.DEBUG)
 
-database = Database(get_settings().database_url, ssl=False, min_size=5, max_size=20)
+@lru_cache()
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(get_engine(), expire_on_commit=False, class_=AsyncSession)
+
 
-engine = create_async_engine(
-    get_settings().async_database_url(),
-    future=True,
-    echo=True,
-)
+def async_session() -> AsyncSession:
+    return get_sessionmaker()()
 
-async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+@asynccontextmanager
+async def traced_session() -> AsyncIterator[AsyncSession]:
+    """
+        Сессия запроса в спане db.session: для get_db и для обработчиков,
+        которые открывают сессию сами (потоковые ответы).
+    """
+    # Спан всей жизни сессии не текущий: SQL и остальные спаны запроса остаются соседями
+    with tracing.span("db.session", current=False):
+        async with async_session() as session:
+            yield session
 
 
 # Dependency
 async def get_db() -> AsyncGenerator:
-    async with async_session() as session:
+    async with traced_session() as session:
         try:
             yield session
-            await session.commit()
+            with tracing.span("db.commit"):
+                await session.commit()
         except SQLAlchemyError as sql_ex:
             await session.rollback()
             raise sql_ex
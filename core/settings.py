@@ -1,5 +1,9 @@
+from typing import Dict, List, Literal
+
 from pydantic_settings import BaseSettings
 
+ASYMMETRIC_JWT_ALGORITHMS = ("EdDSA", "ES256")
+
 
 class AppSettings(BaseSettings):
     app_env: str = 'development'
@@ -13,6 +17,98 @@ class AppSettings(BaseSettings):
     jwt_algorithm: str
     access_token_expire: int
     refresh_token_expire: int
+    jwt_private_key_path: str | None = None
+    jwt_jwks_path: str | None = None
+    jwt_kid: str | None = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 15
+    breed_cache_ttl: int = 300
+    bulk_chunk_size: int = 1000
+    stream_partition_size: int = 500
+    kitty_search_page_size: int = 20
+    # username, которому миграция kittens owner передает существующих котят (обязателен,
+    # если котята есть), а архивация - котят архивированных пользователей; не задан -
+    # котят архивированных пользователей передают вручную через src.kitty.owners
+    kitty_orphan_owner: str | None = None
+    # Ключ секционирования kittens: breed_id - HASH, created_at - RANGE по месяцам
+    kitty_partition_by: Literal["breed_id", "created_at"] = "breed_id"
+    kitty_hash_partitions: int = 8
+    kitty_range_months_ahead: int = 3
+    kitty_backfill_batch_size: int = 5000
+    kitty_backfill_pause: float = 0.0
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    admission_enabled: bool = True
+    # По умолчанию - размер пула БД вместе с overflow
+    admission_max_in_flight: int | None = None
+    admission_max_queue: int = 100
+    admission_max_wait: float = 5.0
+    admission_retry_after: int = 1
+    # "МЕТОД /шаблон пути": приоритет в очереди, меньше - важнее (по умолчанию 1)
+    admission_route_priorities: Dict[str, int] = {
+        "GET /kitty/{kitty_id}": 0,
+        "GET /kitty/batch": 0,
+        "GET /breed/{breed_id}": 0,
+        "GET /breed/all/": 0,
+        "GET /kitty/all/": 2,
+        "PATCH /kitty/bulk": 2,
+        "DELETE /kitty/bulk": 2,
+    }
+    # Маршруты без обращения к БД
+    admission_exempt_routes: List[str] = [
+        "GET /health/live",
+        "GET /health/ready",
+        "GET /health/metrics",
+        "GET /.well-known/jwks.json",
+        "GET /archive/status",
+        "GET /kitty/changes/stream",
+        "GET /openapi.json",
+        "GET /docs",
+        "GET /docs/oauth2-redirect",
+        "GET /redoc",
+    ]
+    changes_page_size: int = 100
+    # Как часто проверять outbox без NOTIFY, секунды; заодно интервал keep-alive в SSE
+    changes_poll_interval: float = 15.0
+    outbox_purge_enabled: bool = True
+    # Сколько дней хранить изменения в outbox; отставшие сильнее курсоры теряют их
+    outbox_retention_days: int = 7
+    outbox_purge_batch_size: int = 1000
+    outbox_purge_interval: int = 3600
+    job_worker_enabled: bool = True
+    job_worker_concurrency: int = 1
+    job_max_attempts: int = 3
+    # Пауза перед повтором: job_retry_backoff * 2^(попытка - 1) секунд
+    job_retry_backoff: float = 5.0
+    # Задача в running дольше этого считается брошенной и забирается снова, секунды
+    job_lock_timeout: int = 600
+    job_poll_interval: float = 5.0
+    archive_enabled: bool = False
+    archive_after_days: int = 30
+    archive_batch_size: int = 500
+    archive_batch_pause: float = 0.5
+    archive_interval: int = 3600
+    token_purge_enabled: bool = True
+    token_purge_batch_size: int = 1000
+    token_purge_interval: int = 3600
+    tracing_enabled: bool = False
+    # Доля трассируемых запросов; при входящем traceparent решает вызывающий сервис
+    tracing_sample_ratio: float = 0.1
+    # console, memory или "модуль:фабрика" своего SpanExporter
+    tracing_exporter: str = "console"
+    tracing_service_name: str = "kitty-api"
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = 'memory'
+    rate_limit_redis_url: str | None = None
+    # "МЕТОД /шаблон пути": {"ip" | "user": "запросов/секунд"}
+    rate_limits: Dict[str, Dict[str, str]] = {
+        "POST /user/login": {"ip": "10/60"},
+        "POST /user/registration": {"ip": "5/60"},
+        "POST /user/refresh": {"ip": "30/60"},
+        "GET /kitty/all/": {"ip": "60/60", "user": "30/60"},
+    }
 
     class Config:
         env_file = '.env'
@@ -26,5 +122,8 @@ class AppSettings(BaseSettings):
     def is_production(self) -> bool:
         return self.app_env == 'production'
 
+    def is_jwt_asymmetric(self) -> bool:
+        return self.jwt_algorithm in ASYMMETRIC_JWT_ALGORITHMS
+
     def async_database_url(self):
         return self.database_url.replace('postgresql', 'postgresql+asyncpg', 1)
@@ -0,0 +1,227 @@
+"""
+    Трассировка запросов в формате OpenTelemetry.
+
+    По умолчанию выключена (tracing_enabled): span() отдает общий пустой
+    контекстный менеджер, а события SQLAlchemy не подключаются, так что
+    вся цена - одна проверка на вызов. Включенная трассировка требует пакет
+    opentelemetry-sdk. Трассируется доля запросов tracing_sample_ratio;
+    если вызывающий сервис прислал traceparent, решение берется из него.
+
+    Экспортер задается tracing_exporter: console, memory (спаны копятся
+    в памяти, для проверок) или "модуль:фабрика" любого SpanExporter,
+    например opentelemetry.exporter.otlp.proto.http.trace_exporter:OTLPSpanExporter.
+    Пакеты opentelemetry импортируются только в setup_tracing, чтобы
+    выключенная трассировка не замедляла старт приложения.
+"""
+import importlib
+from contextlib import nullcontext
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from core.settings import AppSettings
+
+NOOP_SPAN = nullcontext()
+# Спан ожидания соединения живет от начала транзакции сессии до BEGIN
+CHECKOUT_SPAN_KEY = "tracing_checkout_span"
+
+# Заполняются в setup_tracing: модуль opentelemetry.trace и разборщик traceparent
+trace = None
+_propagator = None
+_tracer = None
+_provider = None
+exporter = None
+# Исходный fastapi.routing.serialize_response, пока вместо него стоит обертка со спаном
+_serialize_response = None
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, attributes: Optional[dict] = None, current: bool = True):
+    """
+        Контекстный менеджер спана. current=False - спан не становится
+        текущим, и спаны, открытые внутри, не попадают к нему в дочерние.
+    """
+    if _tracer is None:
+        return NOOP_SPAN
+    if current:
+        return _tracer.start_as_current_span(name, attributes=attributes)
+    return _tracer.start_span(name, attributes=attributes)
+
+
+def request_span(name: str, headers, attributes: dict):
+    """
+        Корневой спан запроса. Если вызывающий сервис прислал traceparent
+        (W3C Trace Context), спан продолжает его трассу.
+    """
+    return _tracer.start_as_current_span(
+        name,
+        context=_propagator.extract(headers),
+        kind=trace.SpanKind.SERVER,
+        attributes=attributes,
+    )
+
+
+def set_response_status(request_span, status_code: int):
+    request_span.set_attribute("http.response.status_code", status_code)
+    if status_code >= 500:
+        request_span.set_status(trace.Status(trace.StatusCode.ERROR))
+
+
+def _recording() -> bool:
+    # Без входящего спана запроса (или если запрос не попал в выборку) SQL не трассируется
+    return trace.get_current_span().is_recording()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not _recording():
+        return
+    operation = statement.split(None, 1)[0].upper() if statement else "SQL"
+    context._tracing_span = _tracer.start_span(
+        operation,
+        kind=trace.SpanKind.CLIENT,
+        attributes={
+            "db.system": "postgresql",
+            "db.operation.name": operation,
+            "db.query.text": statement,
+            "db.executemany": executemany,
+        },
+    )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    statement_span = getattr(context, "_tracing_span", None)
+    if statement_span is not None:
+        if cursor is not None and cursor.rowcount is not None and cursor.rowcount >= 0:
+            statement_span.set_attribute("db.response.returned_rows", cursor.rowcount)
+        statement_span.end()
+        context._tracing_span = None
+
+
+def _handle_error(exception_context):
+    statement_span = getattr(exception_context.execution_context, "_tracing_span", None)
+    if statement_span is not None:
+        statement_span.record_exception(exception_context.original_exception)
+        statement_span.set_status(trace.Status(trace.StatusCode.ERROR))
+        statement_span.end()
+        exception_context.execution_context._tracing_span = None
+
+
+def _after_transaction_create(session, transaction):
+    if transaction.parent is None and _recording():
+        session.info[CHECKOUT_SPAN_KEY] = _tracer.start_span("db.checkout")
+
+
+def _after_begin(session, transaction, connection):
+    checkout_span = session.info.pop(CHECKOUT_SPAN_KEY, None)
+    if checkout_span is not None:
+        checkout_span.end()
+
+
+def _after_transaction_end(session, transaction):
+    # Транзакция закончилась, так и не взяв соединение: спан не отправляется
+    if transaction.parent is None:
+        session.info.pop(CHECKOUT_SPAN_KEY, None)
+
+
+SQL_EVENTS = (
+    (Engine, "before_cursor_execute", _before_cursor_execute),
+    (Engine, "after_cursor_execute", _after_cursor_execute),
+    (Engine, "handle_error", _handle_error),
+    (Session, "after_transaction_create", _after_transaction_create),
+    (Session, "after_begin", _after_begin),
+    (Session, "after_transaction_end", _after_transaction_end),
+)
+
+
+def _instrument_serialization():
+    """
+        Оборачивает в спан serialize_response из FastAPI: проверку ответа
+        по response_model и перевод в JSON-совместимые типы. Ответы, которые
+        роутеры сериализуют сами, размечаются на месте через span.
+    """
+    global _serialize_response
+    import fastapi.routing
+
+    serialize_response = fastapi.routing.serialize_response
+
+    async def traced_serialize_response(*args, **kwargs):
+        with span("response.serialize"):
+            return await serialize_response(*args, **kwargs)
+
+    _serialize_response = serialize_response
+    fastapi.routing.serialize_response = traced_serialize_response
+
+
+def _restore_serialization():
+    global _serialize_response
+    import fastapi.routing
+
+    fastapi.routing.serialize_response = _serialize_response
+    _serialize_response = None
+
+
+def get_exporter(name: str):
+    if name == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+    if name == "memory":
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        return InMemorySpanExporter()
+    module_name, _, factory = name.partition(":")
+    if not factory:
+        raise RuntimeError("tracing_exporter: console, memory или \"модуль:фабрика\"")
+    return getattr(importlib.import_module(module_name), factory)()
+
+
+def setup_tracing(settings: AppSettings):
+    """
+        Включает трассировку: свой TracerProvider (глобальный не трогается),
+        события SQLAlchemy на классах Engine и Session, поэтому движок
+        можно создать и позже, и спан сериализации ответа FastAPI.
+        Повторный вызов ничего не делает. Парный вызов - shutdown_tracing.
+    """
+    global trace, _propagator, _tracer, _provider, exporter
+    if _tracer is not None:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+        from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+    except ImportError as e:
+        raise RuntimeError("Для tracing_enabled нужен пакет opentelemetry-sdk") from e
+
+    _propagator = TraceContextTextMapPropagator()
+    exporter = get_exporter(settings.tracing_exporter)
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    # Спаны в памяти должны быть видны сразу после запроса, остальные уходят пачками в фоне
+    processor = SimpleSpanProcessor if settings.tracing_exporter == "memory" else BatchSpanProcessor
+    _provider.add_span_processor(processor(exporter))
+    _tracer = _provider.get_tracer(__name__)
+    for target, identifier, listener in SQL_EVENTS:
+        event.listen(target, identifier, listener)
+    _instrument_serialization()
+
+
+def shutdown_tracing():
+    """Снимает обертку сериализации и события и отправляет накопленные спаны."""
+    global _tracer, _provider
+    if _tracer is None:
+        return
+    _restore_serialization()
+    for target, identifier, listener in SQL_EVENTS:
+        event.remove(target, identifier, listener)
+    _provider.shutdown()
+    _tracer = _provider = None
@@ -11,6 +11,7 @@ sys.path.append(str(pathlib.Path(__file__).resolve().parents[3]))
 
 from core.session import get_settings
 from database.models import Base
+from database.partitions import KITTY_PARTITION_NAME
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -35,6 +36,13 @@ target_metadata = Base.metadata
 config.set_main_option("sqlalchemy.url", get_settings().database_url)
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # Секции kittens создаются миграцией секционирования, в моделях их нет
+    if type_ == "table" and reflected and compare_to is None and KITTY_PARTITION_NAME.match(name):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -74,7 +82,13 @@ def run_migrations_online():
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata, compare_type=True
+            connection=connection,
+            target_metadata=target_metadata,
+            compare_type=True,
+            include_object=include_object,
+            # Каждая миграция в своей транзакции: блокировки одной (например,
+            # ACCESS EXCLUSIVE при смене kittens) не держатся до конца upgrade head
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,184 @@
+"""kittens partitioning
+
+Revision ID: 5c1f0e7a9b3d
+Revises: 8049ef46922d
+Create Date: 2026-10-19 17:48:12.314095
+
+Переводит kittens на декларативное секционирование по kitty_partition_by
+без долгой блокировки таблицы:
+
+    1. создается теневая секционированная таблица, а триггер на kittens
+       повторяет в ней все INSERT/UPDATE/DELETE;
+    2. строки переносятся пачками по kitty_backfill_batch_size, каждая
+       пачка - отдельная транзакция (autocommit_block);
+    3. под короткой блокировкой таблицы меняются местами. Смена - последний
+       шаг миграции, а env.py коммитит каждую миграцию отдельно
+       (transaction_per_migration), поэтому ACCESS EXCLUSIVE снимается сразу,
+       а не после остальных миграций upgrade head.
+
+Первичный ключ секционированной таблицы - (id, ключ секционирования):
+Postgres не умеет уникальный индекс без ключа секционирования, так что
+уникальность одного id держится только на последовательности kittens_id_seq.
+Котят нельзя вставлять с явным id и менять им id. Запросы только по id
+(GET /kitty/{id}, update, soft_removal, batch) не отсекают секции и проверяют
+индекс первичного ключа в каждой.
+
+Downgrade тем же способом возвращает обычную таблицу.
+"""
+import time
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from core.session import get_settings
+from database.partitions import (
+    KITTY_PARTITION_KEYS, add_months, hash_partitions_ddl, range_partitions_ddl, default_partition_ddl
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1f0e7a9b3d'
+down_revision: Union[str, None] = '8049ef46922d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SHADOW = "kittens_shadow"
+KITTY_COLUMNS = "id, name, color, age, description, breed_id, created_at, updated_at, deleted_at"
+SERIALIZATION_FAILURE = "40001"
+NEW_KITTY_COLUMNS = ", ".join("NEW." + column for column in KITTY_COLUMNS.split(", "))
+
+
+def _drop_leftovers():
+    # Остатки прерванного запуска: перенос начинается заново
+    op.execute("DROP TRIGGER IF EXISTS kittens_mirror ON kittens")
+    op.execute("DROP FUNCTION IF EXISTS kittens_mirror()")
+    op.execute(f"DROP TABLE IF EXISTS {SHADOW}")
+
+
+def _create_shadow(primary_key: str, partition_clause: str = ""):
+    op.execute(f"""
+        CREATE TABLE {SHADOW} (
+            id INTEGER NOT NULL DEFAULT nextval('kittens_id_seq'::regclass),
+            name VARCHAR NOT NULL,
+            color VARCHAR NOT NULL,
+            age INTEGER NOT NULL,
+            description VARCHAR,
+            breed_id INTEGER NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT timezone('utc', now()),
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT timezone('utc', now()),
+            deleted_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT {SHADOW}_pkey PRIMARY KEY ({primary_key}),
+            CONSTRAINT {SHADOW}_breed_id_fkey FOREIGN KEY (breed_id)
+                REFERENCES breeds (id) ON UPDATE CASCADE ON DELETE CASCADE
+        ) {partition_clause}
+    """)
+    op.execute(f"CREATE INDEX ix_{SHADOW}_deleted_at ON {SHADOW} (deleted_at)")
+
+
+def _mirror_writes(partition_key: str):
+    op.execute(f"""
+        CREATE FUNCTION kittens_mirror() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {SHADOW} WHERE id = OLD.id AND {partition_key} = OLD.{partition_key};
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {SHADOW} ({KITTY_COLUMNS}) VALUES ({NEW_KITTY_COLUMNS}) ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(
+        "CREATE TRIGGER kittens_mirror AFTER INSERT OR UPDATE OR DELETE ON kittens "
+        "FOR EACH ROW EXECUTE FUNCTION kittens_mirror()"
+    )
+
+
+def _backfill():
+    """
+        Копирует kittens в теневую таблицу пачками по id. FOR SHARE
+        дожидается конкурентных изменений пачки и берет их последнюю
+        версию, а их копии, уже сделанные триггером, пропускаются по ON CONFLICT.
+        Если строку пачки конкурентно перенесли в другую секцию, Postgres
+        отвечает ошибкой сериализации - такая пачка повторяется.
+    """
+    settings = get_settings()
+    connection = op.get_bind()
+    last_id = 0
+    with op.get_context().autocommit_block():
+        while True:
+            try:
+                copied, batch_last_id = connection.execute(
+                    sa.text(f"""
+                        WITH batch AS (
+                            SELECT {KITTY_COLUMNS} FROM kittens
+                            WHERE id > :last_id
+                            ORDER BY id
+                            LIMIT :batch_size
+                            FOR SHARE
+                        ), copied AS (
+                            INSERT INTO {SHADOW} ({KITTY_COLUMNS})
+                            SELECT {KITTY_COLUMNS} FROM batch
+                            ON CONFLICT DO NOTHING
+                        )
+                        SELECT count(*), max(id) FROM batch
+                    """),
+                    {"last_id": last_id, "batch_size": settings.kitty_backfill_batch_size},
+                ).one()
+            except sa.exc.DBAPIError as error:
+                if getattr(error.orig, "pgcode", None) != SERIALIZATION_FAILURE:
+                    raise
+                continue
+            if not copied:
+                break
+            last_id = batch_last_id
+            if settings.kitty_backfill_pause:
+                time.sleep(settings.kitty_backfill_pause)
+
+
+def _swap():
+    op.execute("LOCK TABLE kittens IN ACCESS EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER kittens_mirror ON kittens")
+    op.execute("DROP FUNCTION kittens_mirror()")
+    op.execute(f"ALTER SEQUENCE kittens_id_seq OWNED BY {SHADOW}.id")
+    op.execute("DROP TABLE kittens")
+    op.execute(f"ALTER TABLE {SHADOW} RENAME TO kittens")
+    op.execute(f"ALTER TABLE kittens RENAME CONSTRAINT {SHADOW}_pkey TO kittens_pkey")
+    op.execute(f"ALTER TABLE kittens RENAME CONSTRAINT {SHADOW}_breed_id_fkey TO kittens_breed_id_fkey")
+    op.execute(f"ALTER INDEX ix_{SHADOW}_deleted_at RENAME TO ix_kittens_deleted_at")
+
+
+def _partitions_ddl(partition_by: str) -> Sequence[str]:
+    settings = get_settings()
+    if partition_by == "breed_id":
+        return hash_partitions_ddl(SHADOW, settings.kitty_hash_partitions)
+
+    current_month = date.today().replace(day=1)
+    first_created_at = op.get_bind().execute(sa.text("SELECT min(created_at) FROM kittens")).scalar()
+    first_month = first_created_at.date().replace(day=1) if first_created_at else current_month
+    return [
+        *range_partitions_ddl(SHADOW, first_month, add_months(current_month, settings.kitty_range_months_ahead)),
+        default_partition_ddl(SHADOW),
+    ]
+
+
+def upgrade() -> None:
+    partition_by = get_settings().kitty_partition_by
+    _drop_leftovers()
+    _create_shadow(f"id, {partition_by}", f"PARTITION BY {KITTY_PARTITION_KEYS[partition_by]}")
+    for statement in _partitions_ddl(partition_by):
+        op.execute(statement)
+    _mirror_writes(partition_by)
+    _backfill()
+    _swap()
+
+
+def downgrade() -> None:
+    _drop_leftovers()
+    _create_shadow("id")
+    _mirror_writes("id")
+    _backfill()
+    _swap()
@@ -0,0 +1,96 @@
+"""kittens owner
+
+Revision ID: db9d27221ec4
+Revises: 1b10e8e77fc9
+Create Date: 2026-10-19 18:03:50.774647
+
+Существующие котята передаются пользователю KITTY_ORPHAN_OWNER пачками по
+kitty_backfill_batch_size, каждая пачка - отдельная транзакция. Котенок
+без владельца не виден никому, поэтому, если котята есть, а владелец не
+задан или не найден, миграция не применяется.
+"""
+import time
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from core.session import get_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'db9d27221ec4'
+down_revision: Union[str, None] = '1b10e8e77fc9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _orphan_owner_id() -> Optional[int]:
+    connection = op.get_bind()
+    if not connection.execute(sa.text("SELECT EXISTS (SELECT 1 FROM kittens)")).scalar():
+        return None
+    username = get_settings().kitty_orphan_owner
+    if not username:
+        raise RuntimeError("В kittens есть котята: задайте KITTY_ORPHAN_OWNER - пользователя, которому они перейдут")
+    owner_id = connection.execute(
+        sa.text('SELECT id FROM "user" WHERE username = :username AND deleted_at IS NULL'),
+        {"username": username},
+    ).scalar()
+    if owner_id is None:
+        raise RuntimeError(f"Нет пользователя {username} из KITTY_ORPHAN_OWNER")
+    return owner_id
+
+
+def _backfill(owner_id: int):
+    """
+        Проставляет owner_id пачками по id через индекс ix_kittens_owner_id.
+        Заканчивает, только когда пачка ничего не изменила.
+    """
+    settings = get_settings()
+    connection = op.get_bind()
+    with op.get_context().autocommit_block():
+        while True:
+            assigned = connection.execute(
+                sa.text("""
+                    WITH batch AS (
+                        SELECT id FROM kittens
+                        WHERE owner_id IS NULL
+                        ORDER BY id
+                        LIMIT :batch_size
+                        FOR UPDATE
+                    )
+                    UPDATE kittens SET owner_id = :owner_id
+                    FROM batch
+                    WHERE kittens.id = batch.id AND kittens.owner_id IS NULL
+                """),
+                {"owner_id": owner_id, "batch_size": settings.kitty_backfill_batch_size},
+            ).rowcount
+            if not assigned:
+                break
+            if settings.kitty_backfill_pause:
+                time.sleep(settings.kitty_backfill_pause)
+
+
+def upgrade() -> None:
+    owner_id = _orphan_owner_id()
+    # Колонка без DEFAULT добавляется без перезаписи таблицы, значения
+    # проставляются пачками уже после индексов
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column('kittens', sa.Column('owner_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_kittens_owner_id'), 'kittens', ['owner_id'], unique=False)
+    op.create_index('ix_kittens_owner_id_id', 'kittens', ['owner_id', 'id'], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_foreign_key(op.f('kittens_owner_id_fkey'), 'kittens', 'user', ['owner_id'], ['id'], ondelete='SET NULL')
+    op.add_column('kittens_archive', sa.Column('owner_id', sa.Integer(), nullable=True))
+    # ### end Alembic commands ###
+    if owner_id is not None:
+        _backfill(owner_id)
+
+
+def downgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_column('kittens_archive', 'owner_id')
+    op.drop_constraint(op.f('kittens_owner_id_fkey'), 'kittens', type_='foreignkey')
+    op.drop_index('ix_kittens_owner_id_id', table_name='kittens', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.drop_index(op.f('ix_kittens_owner_id'), table_name='kittens')
+    op.drop_column('kittens', 'owner_id')
+    # ### end Alembic commands ###
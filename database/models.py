@@ -1,8 +1,12 @@
 import sqlalchemy as sa
-from sqlalchemy import Column, String, Integer, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, BigInteger, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.ext.declarative import declarative_base
 
+from core.session import get_settings
+from database.partitions import KITTY_PARTITION_KEYS
+
 convention = {
     "ix": "ix_%(column_0_label)s",
     "uq": "%(table_name)s_%(column_0_name)s_key",
@@ -16,6 +20,9 @@ metadata = sa.MetaData(naming_convention=convention)
 Base = declarative_base(metadata=metadata)
 
 NOW_AT_UTC = sa.text("timezone('utc', now())")
+CURRENT_XACT_ID = sa.text("pg_current_xact_id()::text::bigint")
+# Без стемминга: в именах и описаниях смешаны русский и английский
+KITTY_SEARCH_CONFIG = "simple"
 
 
 class TimestampMixin:
@@ -54,6 +61,24 @@ class SoftDeleteMixin:
     deleted_at = Column(sa.TIMESTAMP(timezone=False), nullable=True, index=True)
 
 
+class ArchivedMixin:
+    """
+    Миксин для архивных таблиц, куда переносятся давно удаленные записи.
+
+    Атрибуты:
+    ----------
+    :param deleted_at: время мягкого удаления исходной записи.
+    :type datetime.datetime
+    :param archived_at: время переноса записи в архив.
+    :type datetime.datetime
+    """
+
+    deleted_at = Column(sa.TIMESTAMP(timezone=False), nullable=False)
+    archived_at = Column(
+        sa.TIMESTAMP(timezone=False), server_default=NOW_AT_UTC, nullable=False
+    )
+
+
 class User(Base, TimestampMixin, SoftDeleteMixin):
     """
         Модель пользователя
@@ -65,18 +90,71 @@ class User(Base, TimestampMixin, SoftDeleteMixin):
     id: int = Column(Integer, primary_key=True, autoincrement=True)
     username: str = Column(String, nullable=False, unique=True)
     password_hash: str = Column(String, nullable=False)
-    refresh_token: str = Column(String, nullable=False)
+
+
+class RefreshToken(Base):
+    """
+        Выданные refresh токены, ключ - jti из payload токена
+
+        Таблица: refresh_tokens
+    """
+    __tablename__ = 'refresh_tokens'
+
+    jti: str = Column(String, primary_key=True)
+    user_id: int = Column(
+        Integer,
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    created_at = Column(
+        sa.TIMESTAMP(timezone=False), server_default=NOW_AT_UTC, nullable=False
+    )
+    expires_at = Column(sa.TIMESTAMP(timezone=False), nullable=False, index=True)
+    revoked_at = Column(sa.TIMESTAMP(timezone=False), nullable=True)
 
 
 class Kitty(Base, TimestampMixin, SoftDeleteMixin):
     """
         Модель котят
 
-        Таблица: kittens
+        Таблица: kittens, секционирована по kitty_partition_by
+        (HASH по breed_id или RANGE по created_at). Ключ секционирования
+        входит в первичный ключ, поэтому UPDATE из ORM попадает в одну секцию.
+        Уникальность самого id обеспечивает только последовательность:
+        явный id при вставке не передается. Поиск только по id проверяет
+        индекс первичного ключа в каждой секции.
+
+        version - счетчик изменений для оптимистичной блокировки: ORM
+        обновляет строку с условием на прочитанную версию и увеличивает ее.
+
+        search_vector - вычисляемый tsvector по name (вес A) и description
+        (вес B) для полнотекстового поиска; GIN-индекс только по живым строкам.
+        Колонка отложенная: select(Kitty) ее не читает.
+
+        owner_id - пользователь, создавший котенка: чтение, поиск, списки,
+        изменения и лента изменений ограничены владельцем. Частичный индекс
+        (owner_id, id) по живым строкам отдает котят пользователя по порядку
+        id. Отдельный индекс
+        по owner_id нужен для ON DELETE SET NULL при архивации пользователя
+        и для поиска котят без владельца (см. src.kitty.owners).
     """
     __tablename__ = 'kittens'
+    __table_args__ = (
+        sa.PrimaryKeyConstraint("id", get_settings().kitty_partition_by),
+        sa.Index(
+            'ix_kittens_search_vector', 'search_vector',
+            postgresql_using='gin',
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+        sa.Index(
+            'ix_kittens_owner_id_id', 'owner_id', 'id',
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+        {"postgresql_partition_by": KITTY_PARTITION_KEYS[get_settings().kitty_partition_by]},
+    )
 
-    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    id: int = Column(Integer, autoincrement=True)
     name: str = Column(String, nullable=False)
     color: str = Column(String, nullable=False)
     age: int = Column(
@@ -90,9 +168,27 @@ class Kitty(Base, TimestampMixin, SoftDeleteMixin):
         ForeignKey("breeds.id", onupdate="CASCADE", ondelete="CASCADE"),
         nullable=False,
     )
+    owner_id: int = Column(
+        Integer,
+        ForeignKey("user.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+
+    version: int = Column(Integer, nullable=False, server_default="1")
+    search_vector = deferred(Column(
+        TSVECTOR,
+        sa.Computed(
+            f"setweight(to_tsvector('{KITTY_SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{KITTY_SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    ))
 
     breed = relationship("Breed", back_populates="kittens")
 
+    __mapper_args__ = {"version_id_col": version, "eager_defaults": True}
+
 
 class Breed(Base):
     """
@@ -106,3 +202,107 @@ class Breed(Base):
     description: str = Column(String, nullable=True)
 
     kittens = relationship("Kitty", back_populates="breed")
+
+
+class UserArchive(Base, TimestampMixin, ArchivedMixin):
+    """
+        Архив удаленных пользователей
+
+        Таблица: user_archive
+    """
+    __tablename__ = 'user_archive'
+
+    id: int = Column(Integer, primary_key=True, autoincrement=False)
+    username: str = Column(String, nullable=False)
+    password_hash: str = Column(String, nullable=False)
+
+
+class KittyArchive(Base, TimestampMixin, ArchivedMixin):
+    """
+        Архив удаленных котят
+
+        Таблица: kittens_archive
+    """
+    __tablename__ = 'kittens_archive'
+
+    id: int = Column(Integer, primary_key=True, autoincrement=False)
+    name: str = Column(String, nullable=False)
+    color: str = Column(String, nullable=False)
+    age: int = Column(Integer, nullable=False)
+    description: str = Column(String, nullable=True)
+    breed_id: int = Column(Integer, nullable=False)
+    owner_id: int = Column(Integer, nullable=True)
+    version: int = Column(Integer, nullable=False, server_default="1")
+
+
+class ChangeOutbox(Base):
+    """
+        Журнал изменений котят и пород для ленты изменений.
+
+        Строка пишется в той же транзакции, что и само изменение. tx_id - id
+        этой транзакции: лента отдает строки в порядке (tx_id, seq) и только
+        из транзакций старше самой старой незавершенной, поэтому курсор не
+        перескакивает через изменения, которые закоммитятся позже.
+
+        owner_id - владелец котенка: изменения котят видит только он.
+        Строки без owner_id (породы) видны всем. Индекс (owner_id, tx_id, seq)
+        отдает по порядку обе части ленты пользователя.
+
+        Строки старше outbox_retention_days удаляет src.changes.purge.
+
+        Таблица: outbox
+    """
+    __tablename__ = 'outbox'
+    __table_args__ = (
+        sa.Index('ix_outbox_owner_id_tx_id_seq', 'owner_id', 'tx_id', 'seq'),
+    )
+
+    seq: int = Column(BigInteger, primary_key=True, autoincrement=True)
+    tx_id: int = Column(BigInteger, server_default=CURRENT_XACT_ID, nullable=False)
+    entity: str = Column(String, nullable=False)
+    entity_id: int = Column(Integer, nullable=False)
+    owner_id: int = Column(Integer, nullable=True)
+    operation: str = Column(String, nullable=False)
+    payload: dict = Column(JSONB, nullable=False)
+    created_at = Column(
+        sa.TIMESTAMP(timezone=False), server_default=NOW_AT_UTC, nullable=False, index=True
+    )
+
+
+class Job(Base, TimestampMixin):
+    """
+        Фоновая задача для тяжелых записей (массовые изменения, импорт).
+
+        Воркер забирает задачу через SELECT ... FOR UPDATE SKIP LOCKED,
+        переводит в running и выполняет в отдельной транзакции. Упавшая
+        задача возвращается в queued с отложенным run_after, пока не
+        кончатся попытки. Задача running с просроченным locked_at
+        считается брошенной (воркер упал) и забирается снова.
+
+        Таблица: jobs
+    """
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        sa.Index(
+            'ix_jobs_claimable', 'run_after', 'id',
+            postgresql_where=sa.text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id: int = Column(BigInteger, primary_key=True, autoincrement=True)
+    kind: str = Column(String, nullable=False)
+    payload: dict = Column(JSONB, nullable=False)
+    status: str = Column(String, nullable=False, server_default="queued")
+    attempts: int = Column(Integer, nullable=False, server_default="0")
+    max_attempts: int = Column(Integer, nullable=False)
+    run_after = Column(
+        sa.TIMESTAMP(timezone=False), server_default=NOW_AT_UTC, nullable=False
+    )
+    locked_at = Column(sa.TIMESTAMP(timezone=False), nullable=True)
+    result: dict = Column(JSONB, nullable=True)
+    error: str = Column(String, nullable=True)
+    user_id: int = Column(
+        Integer,
+        ForeignKey("user.id", ondelete="SET NULL"),
+        nullable=True,
+    )
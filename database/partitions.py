@@ -0,0 +1,89 @@
+"""
+    Секционирование таблицы kittens.
+
+    DDL секций используется миграцией, которая переводит kittens на
+    декларативное секционирование, и командой обслуживания, которая
+    заранее создает месячные секции при RANGE по created_at:
+
+        python -m database.partitions --months-ahead 3
+"""
+import argparse
+import re
+from datetime import date
+from typing import List
+
+import sqlalchemy as sa
+
+KITTY_PARTITION_KEYS = {
+    "breed_id": "HASH (breed_id)",
+    "created_at": "RANGE (created_at)",
+}
+KITTY_PARTITION_PREFIX = "kittens"
+KITTY_PARTITION_NAME = re.compile(rf"^{KITTY_PARTITION_PREFIX}_(p\d+|y\d{{4}}m\d{{2}}|default)$")
+
+
+def add_months(month: date, months: int) -> date:
+    month_index = month.year * 12 + month.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def hash_partitions_ddl(parent: str, count: int) -> List[str]:
+    return [
+        f"CREATE TABLE {KITTY_PARTITION_PREFIX}_p{remainder} PARTITION OF {parent} "
+        f"FOR VALUES WITH (MODULUS {count}, REMAINDER {remainder})"
+        for remainder in range(count)
+    ]
+
+
+def range_partitions_ddl(parent: str, first_month: date, last_month: date) -> List[str]:
+    """
+        Месячные секции с first_month по last_month включительно.
+        Уже существующие секции пропускаются.
+    """
+    statements = []
+    month = first_month.replace(day=1)
+    while month <= last_month:
+        next_month = add_months(month, 1)
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {KITTY_PARTITION_PREFIX}_{month:y%Ym%m} PARTITION OF {parent} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    return statements
+
+
+def default_partition_ddl(parent: str) -> str:
+    return f"CREATE TABLE {KITTY_PARTITION_PREFIX}_default PARTITION OF {parent} DEFAULT"
+
+
+def premake_range_partitions(connection: sa.Connection, months_ahead: int, today: date = None) -> List[str]:
+    """
+        Создает секции kittens на текущий и months_ahead следующих месяцев.
+        Секцию нужно создать до того, как в нее пойдут строки: иначе они
+        попадут в секцию DEFAULT и новую секцию на этот месяц не создать.
+    """
+    current_month = (today or date.today()).replace(day=1)
+    statements = range_partitions_ddl("kittens", current_month, add_months(current_month, months_ahead))
+    for statement in statements:
+        connection.execute(sa.text(statement))
+    return statements
+
+
+def main():
+    from core.session import get_settings
+
+    parser = argparse.ArgumentParser(description="Создание месячных секций kittens заранее")
+    parser.add_argument("--months-ahead", type=int, default=get_settings().kitty_range_months_ahead)
+    args = parser.parse_args()
+
+    if get_settings().kitty_partition_by != "created_at":
+        parser.exit(message="kittens секционирована не по created_at, месячные секции не нужны\n")
+
+    engine = sa.create_engine(get_settings().database_url)
+    with engine.begin() as connection:
+        for statement in premake_range_partitions(connection, args.months_ahead):
+            print(statement)
+
+
+if __name__ == "__main__":
+    main()
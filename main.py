@@ -1,13 +1,87 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
-from core.session import get_settings
+from core.notifications import listener
+from core.session import get_settings, get_engine
+from core.tracing import setup_tracing, shutdown_tracing
 from src.api import api_router
+from src.archive.job import archive_forever
+from src.changes.purge import purge_old_changes_forever
+from src.jobs.worker import work_forever
+from src.middleware.admission import AdmissionController, AdmissionControlMiddleware
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.rate_limit import RateLimitMiddleware, get_bucket_store
+from src.middleware.tracing import TracingMiddleware
+from src.user.token_purge import purge_expired_tokens_forever
+from src.warmup import warm_up
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    application.state.ready = False
+    if get_settings().tracing_enabled:
+        setup_tracing(get_settings())
+    await warm_up()
+    application.state.ready = True
+
+    background_tasks = []
+    if get_settings().archive_enabled:
+        background_tasks.append(asyncio.create_task(archive_forever()))
+    if get_settings().token_purge_enabled:
+        background_tasks.append(asyncio.create_task(purge_expired_tokens_forever()))
+    if get_settings().outbox_purge_enabled:
+        background_tasks.append(asyncio.create_task(purge_old_changes_forever()))
+    if get_settings().job_worker_enabled:
+        background_tasks.extend(
+            asyncio.create_task(work_forever()) for _ in range(get_settings().job_worker_concurrency)
+        )
+
+    yield
+
+    application.state.ready = False
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await listener.close()
+    await get_engine().dispose()
+    shutdown_tracing()
 
 
 def get_application() -> FastAPI:
-    application = FastAPI(root_path=get_settings().root_path)
+    settings = get_settings()
+    application = FastAPI(root_path=settings.root_path, lifespan=lifespan)
 
     application.include_router(api_router)
 
+    if settings.compression_enabled:
+        application.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+        )
+    if settings.admission_enabled:
+        application.state.admission = AdmissionController(
+            max_in_flight=settings.admission_max_in_flight or settings.db_pool_size + settings.db_max_overflow,
+            max_queue=settings.admission_max_queue,
+            max_wait=settings.admission_max_wait,
+        )
+        application.add_middleware(
+            AdmissionControlMiddleware,
+            controller=application.state.admission,
+            priorities=settings.admission_route_priorities,
+            exempt=settings.admission_exempt_routes,
+            retry_after=settings.admission_retry_after,
+        )
+    # Добавленный последним middleware внешний: лимиты проверяются раньше всего остального,
+    # а спан запроса (если трассировка включена) охватывает и их
+    if settings.rate_limit_enabled:
+        application.add_middleware(RateLimitMiddleware, store=get_bucket_store(settings), settings=settings)
+    if settings.tracing_enabled:
+        application.add_middleware(TracingMiddleware)
+
     return application
 
 
@@ -2,9 +2,17 @@ from fastapi import APIRouter
 from src.user.router import router as users_router
 from src.breed.router import router as breeds_router
 from src.kitty.router import router as kittens_router
+from src.changes.router import router as changes_router
+from src.health.router import router as health_router
+from src.archive.router import router as archive_router
+from src.jobs.router import router as jobs_router
 
 api_router = APIRouter()
 
 api_router.include_router(users_router, tags=["user"])
 api_router.include_router(breeds_router, tags=["breed"])
+api_router.include_router(changes_router, tags=["changes"])
 api_router.include_router(kittens_router, tags=["kitty"])
+api_router.include_router(health_router, tags=["health"])
+api_router.include_router(archive_router, tags=["archive"])
+api_router.include_router(jobs_router, tags=["jobs"])
@@ -0,0 +1,160 @@
+"""
+    Перенос давно удаленных (soft delete) записей в архивные таблицы.
+
+    Запуск разово из командной строки:
+        python -m src.archive.job --older-than-days 30
+
+    или периодически в фоне приложения (archive_enabled=True).
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import select, delete, insert
+
+from core.session import async_session, get_settings, get_engine
+from database.models import Kitty, KittyArchive, User, UserArchive
+from src.kitty.owners import assign_orphans, find_owner_id
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_TABLES = (
+    (Kitty.__table__, KittyArchive.__table__),
+    (User.__table__, UserArchive.__table__),
+)
+
+
+class ArchiveProgress:
+    """
+        Прогресс архивации в текущем процессе.
+    """
+
+    def __init__(self):
+        self.running: bool = False
+        self.runs: int = 0
+        self.batches: int = 0
+        self.moved: Dict[str, int] = {table.name: 0 for table, _ in ARCHIVED_TABLES}
+        self.last_started_at: Optional[datetime] = None
+        self.last_finished_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+
+progress = ArchiveProgress()
+
+
+def archive_batch_statement(table: sa.Table, archive_table: sa.Table, cutoff: datetime, batch_size: int):
+    """
+        Один батч: DELETE ... RETURNING строк, удаленных раньше cutoff, и INSERT
+        их в архив одним запросом. Строки, заблокированные другими транзакциями,
+        пропускаются (SKIP LOCKED), поэтому параллельные запуски не мешают друг другу.
+        Переносятся все колонки, кроме вычисляемых: если какой-то нет в архиве,
+        батч не строится, чтобы данные не терялись молча.
+    """
+    columns = [column.name for column in table.c if column.computed is None]
+    missing = [name for name in columns if name not in archive_table.c]
+    if missing:
+        raise RuntimeError(f"В {archive_table.name} нет колонок {table.name}: {', '.join(missing)}")
+    doomed_ids = (
+        select(table.c.id)
+        .where(table.c.deleted_at < cutoff)
+        .order_by(table.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(table)
+        .where(table.c.id.in_(doomed_ids.scalar_subquery()))
+        .returning(*(table.c[name] for name in columns))
+        .cte("moved")
+    )
+    return (
+        insert(archive_table)
+        .from_select(columns, select(*(moved.c[name] for name in columns)))
+        .returning(archive_table.c.id)
+    )
+
+
+async def archive_table(table: sa.Table, archive_table: sa.Table, cutoff: datetime) -> int:
+    settings = get_settings()
+    moved_total = 0
+    while True:
+        async with async_session() as session:
+            moved = len((
+                await session.execute(
+                    archive_batch_statement(table, archive_table, cutoff, settings.archive_batch_size)
+                )
+            ).all())
+            await session.commit()
+
+        moved_total += moved
+        progress.batches += 1
+        progress.moved[table.name] += moved
+        logger.info("Архивация %s: перенесено %s (всего %s)", table.name, moved, moved_total)
+        if moved < settings.archive_batch_size:
+            return moved_total
+        await asyncio.sleep(settings.archive_batch_pause)
+
+
+async def run_archive(older_than_days: Optional[int] = None) -> Dict[str, int]:
+    """
+        Переносит в архив все записи, удаленные более older_than_days дней назад.
+        Котята архивированных пользователей остаются без владельца; если задан
+        kitty_orphan_owner, они сразу передаются ему.
+    """
+    days = older_than_days if older_than_days is not None else get_settings().archive_after_days
+    cutoff = datetime.now() - timedelta(days=days)
+
+    progress.running = True
+    progress.runs += 1
+    progress.last_started_at = datetime.now()
+    progress.last_error = None
+    try:
+        moved = {
+            table.name: await archive_table(table, archive, cutoff)
+            for table, archive in ARCHIVED_TABLES
+        }
+        orphan_owner = get_settings().kitty_orphan_owner
+        if orphan_owner:
+            moved["orphan_kittens"] = await assign_orphans(await find_owner_id(orphan_owner))
+        return moved
+    except Exception as e:
+        progress.last_error = repr(e)
+        raise e
+    finally:
+        progress.running = False
+        progress.last_finished_at = datetime.now()
+
+
+async def archive_forever():
+    """
+        Фоновая задача приложения: архивация раз в archive_interval секунд.
+    """
+    while True:
+        try:
+            await run_archive()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Ошибка архивации")
+        await asyncio.sleep(get_settings().archive_interval)
+
+
+async def _run_cli(older_than_days: Optional[int]):
+    try:
+        moved = await run_archive(older_than_days)
+    finally:
+        await get_engine().dispose()
+    for table_name, count in moved.items():
+        print(f"{table_name}: {count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Перенос давно удаленных записей в архивные таблицы.")
+    parser.add_argument("--older-than-days", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_cli(args.older_than_days))
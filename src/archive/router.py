@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+
+from src.archive.job import progress
+from src.archive.schemas import ArchiveStatusOut
+from src.dependencies.authentication import get_token_payload
+
+router = APIRouter(dependencies=[Depends(get_token_payload)])
+
+
+@router.get(
+    "/archive/status",
+    response_model=ArchiveStatusOut,
+    description="Прогресс переноса удаленных записей в архив в текущем процессе.",
+    summary="Прогресс архивации.",
+    responses={
+        200: {"description": "Успешный запрос."},
+    }
+)
+async def archive_status():
+    return ArchiveStatusOut(
+        running=progress.running,
+        runs=progress.runs,
+        batches=progress.batches,
+        moved=progress.moved,
+        last_started_at=progress.last_started_at,
+        last_finished_at=progress.last_finished_at,
+        last_error=progress.last_error,
+    )
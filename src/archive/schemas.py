@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class ArchiveStatusOut(BaseModel):
+    running: bool
+    runs: int
+    batches: int
+    moved: Dict[str, int]
+    last_started_at: datetime | None
+    last_finished_at: datetime | None
+    last_error: str | None
@@ -0,0 +1,88 @@
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.session import get_settings
+from database.models import Breed
+from src.breed.schemas import BreedOut, BreedOutList
+
+
+class BreedCatalog:
+    """
+        Кэш справочника пород в памяти процесса.
+
+        Заполняется при старте приложения, живет breed_cache_ttl секунд
+        и сбрасывается после коммита транзакции, добавившей породу. Список
+        хранится и в готовом JSON, чтобы не сериализовать его на каждый запрос.
+
+        Загрузка, начатая до сброса, могла прочитать старый список: такой
+        результат отдается своему запросу, но в кэш не попадает (_generation).
+    """
+
+    def __init__(self):
+        self._breeds: Optional[Dict[int, BreedOut]] = None
+        self._body: bytes = b""
+        self._loaded_at: float = 0.0
+        self._generation: int = 0
+
+    def is_fresh(self) -> bool:
+        if self._breeds is None:
+            return False
+        return time.monotonic() - self._loaded_at < get_settings().breed_cache_ttl
+
+    def invalidate(self):
+        self._breeds = None
+        self._generation += 1
+
+    def invalidate_on_commit(self, db_connect: AsyncSession):
+        """
+            Сброс после коммита сессии: до коммита другие запросы новую
+            породу не видят, и сброшенный раньше кэш заполнился бы старым
+            списком на весь breed_cache_ttl. При откате кэш не трогается.
+        """
+        event.listen(db_connect.sync_session, "after_commit", lambda session: self.invalidate(), once=True)
+
+    async def _load(self, db_connect: AsyncSession):
+        generation = self._generation
+        breeds = (
+            await db_connect.execute(
+                select(Breed)
+                .order_by(Breed.id)
+            )
+        ).scalars().all()
+        catalog = {
+            breed.id: BreedOut(id=breed.id, name=breed.name, description=breed.description)
+            for breed in breeds
+        }
+        body = BreedOutList(breed=list(catalog.values())).model_dump_json().encode()
+        if generation == self._generation:
+            self._breeds = catalog
+            self._body = body
+            self._loaded_at = time.monotonic()
+        return catalog, body
+
+    async def load(self, db_connect: AsyncSession) -> List[BreedOut]:
+        catalog, _ = await self._load(db_connect)
+        return list(catalog.values())
+
+    async def all(self, db_connect: AsyncSession) -> List[BreedOut]:
+        if not self.is_fresh():
+            return await self.load(db_connect)
+        return list(self._breeds.values())
+
+    async def all_json(self, db_connect: AsyncSession) -> bytes:
+        if not self.is_fresh():
+            _, body = await self._load(db_connect)
+            return body
+        return self._body
+
+    async def get(self, breed_id: int, db_connect: AsyncSession) -> Optional[BreedOut]:
+        if not self.is_fresh():
+            catalog, _ = await self._load(db_connect)
+            return catalog.get(breed_id)
+        return self._breeds.get(breed_id)
+
+
+breed_catalog = BreedCatalog()
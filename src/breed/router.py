@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.session import get_db
 from database.models import Breed
+from src.breed.cache import breed_catalog
 from src.breed.schemas import BreedOut, BreedOutList, BreedIn
+from src.changes.outbox import record_change
 from src.dependencies.authentication import get_token_payload
 
 router = APIRouter(dependencies=[Depends(get_token_payload)])
@@ -29,6 +31,9 @@ async def get_breed(
         breed_id: int,
         db_connect: AsyncSession = Depends(get_db),
 ):
+    cached_breed = await breed_catalog.get(breed_id, db_connect)
+    if cached_breed:
+        return cached_breed
     breed = (await db_connect.execute(select(Breed).filter(Breed.id == breed_id))).scalar()
     if not breed:
         raise HTTPException(status_code=404, detail="Нет породы с таким id")
@@ -54,14 +59,7 @@ async def get_breed(
 async def get_all_breeds(
         db_connect: AsyncSession = Depends(get_db),
 ):
-    breeds = (
-        await db_connect.execute(
-            select(Breed)
-            .order_by(Breed.id)
-        )
-    ).scalars().all()
-    breed_out_list = [BreedOut(id=breed.id, name=breed.name, description=breed.description) for breed in breeds]
-    return BreedOutList(breed=breed_out_list)
+    return Response(content=await breed_catalog.all_json(db_connect), media_type="application/json")
 
 
 @router.post(
@@ -88,10 +86,13 @@ async def create_breed(
     db_connect.add(breed_add)
     await db_connect.flush()
     await db_connect.refresh(breed_add)
-    return BreedOut(
+    breed_catalog.invalidate_on_commit(db_connect)
+    breed_out = BreedOut(
         id=breed_add.id,
         name=breed_add.name,
         description=breed_add.description
     )
+    record_change(db_connect, "breed", "create", breed_out)
+    return breed_out
 
 
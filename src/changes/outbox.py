@@ -0,0 +1,110 @@
+from typing import List, Optional, Tuple
+
+import sqlalchemy as sa
+from pydantic import BaseModel
+from sqlalchemy import select, insert, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from database.models import ChangeOutbox
+from src.changes.schemas import ChangeOut, ChangePage
+
+START_CURSOR = "0-0"
+CURSOR_PATTERN = r"^\d+-\d+$"
+
+# Транзакции с id меньше этого уже завершены, новых строк с таким tx_id не появится
+VISIBLE_TX_BOUNDARY = sa.literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+
+def record_change(
+        db_connect: AsyncSession, entity: str, operation: str, entity_out: BaseModel, owner_id: Optional[int] = None
+):
+    """
+        Добавляет изменение в outbox; запись уйдет в БД в той же транзакции.
+        owner_id - кому видно изменение, None - всем.
+    """
+    db_connect.add(ChangeOutbox(
+        entity=entity,
+        entity_id=entity_out.id,
+        owner_id=owner_id,
+        operation=operation,
+        payload=entity_out.model_dump(mode="json"),
+    ))
+
+
+async def record_changes(
+        db_connect: AsyncSession,
+        entity: str,
+        operation: str,
+        entities_out: List[BaseModel],
+        owner_id: Optional[int] = None,
+):
+    """
+        Массовый вариант record_change одним INSERT.
+    """
+    if not entities_out:
+        return
+    await db_connect.execute(
+        insert(ChangeOutbox),
+        [
+            {
+                "entity": entity,
+                "entity_id": entity_out.id,
+                "owner_id": owner_id,
+                "operation": operation,
+                "payload": entity_out.model_dump(mode="json"),
+            }
+            for entity_out in entities_out
+        ],
+    )
+
+
+def parse_cursor(cursor: str) -> Tuple[int, int]:
+    tx_id, seq = cursor.split("-")
+    return int(tx_id), int(seq)
+
+
+def make_cursor(tx_id: int, seq: int) -> str:
+    return f"{tx_id}-{seq}"
+
+
+async def read_changes(
+        db_connect: AsyncSession, cursor: str, limit: int, owner_id: int, entity: Optional[str] = None
+) -> ChangePage:
+    """
+        Страница изменений после cursor, видимых пользователю owner_id: его
+        собственные и общие (owner_id IS NULL). Каждая часть читается по
+        индексу (owner_id, tx_id, seq) не дальше limit строк, затем они
+        сливаются в порядке (tx_id, seq).
+    """
+    tx_id, seq = parse_cursor(cursor)
+    parts = []
+    for visible in (ChangeOutbox.owner_id == owner_id, ChangeOutbox.owner_id == None):
+        part = (
+            select(ChangeOutbox)
+            .filter(
+                visible,
+                tuple_(ChangeOutbox.tx_id, ChangeOutbox.seq) > tuple_(tx_id, seq),
+                ChangeOutbox.tx_id < VISIBLE_TX_BOUNDARY,
+            )
+            .order_by(ChangeOutbox.tx_id, ChangeOutbox.seq)
+            .limit(limit)
+        )
+        if entity is not None:
+            part = part.filter(ChangeOutbox.entity == entity)
+        parts.append(part)
+    change = aliased(ChangeOutbox, union_all(*parts).subquery())
+    query = select(change).order_by(change.tx_id, change.seq).limit(limit)
+
+    rows = (await db_connect.execute(query)).scalars().all()
+    changes = [
+        ChangeOut(
+            cursor=make_cursor(row.tx_id, row.seq),
+            entity=row.entity,
+            entity_id=row.entity_id,
+            operation=row.operation,
+            payload=row.payload,
+            created_at=row.created_at,
+        ) for row in rows
+    ]
+    return ChangePage(changes=changes, next_cursor=changes[-1].cursor if changes else cursor)
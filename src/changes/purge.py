@@ -0,0 +1,78 @@
+"""
+    Удаление из outbox изменений старше outbox_retention_days пачками.
+
+    Запуск разово из командной строки:
+        python -m src.changes.purge
+
+    или периодически в фоне приложения (outbox_purge_enabled=True).
+    Клиент, чей курсор отстал больше чем на срок хранения, пропустит
+    удаленные изменения и должен заново загрузить данные целиком.
+"""
+import asyncio
+import logging
+from datetime import timedelta
+
+import sqlalchemy as sa
+from sqlalchemy import select, delete
+
+from core.session import async_session, get_settings, get_engine
+from database.models import ChangeOutbox
+
+logger = logging.getLogger(__name__)
+
+DB_NOW = sa.func.timezone("utc", sa.func.now())
+
+
+def purge_batch_statement(retention: timedelta, batch_size: int):
+    old_seq = (
+        select(ChangeOutbox.seq)
+        .where(ChangeOutbox.created_at < DB_NOW - retention)
+        .limit(batch_size)
+    )
+    return (
+        delete(ChangeOutbox)
+        .where(ChangeOutbox.seq.in_(old_seq.scalar_subquery()))
+        .returning(ChangeOutbox.seq)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def purge_old_changes() -> int:
+    settings = get_settings()
+    statement = purge_batch_statement(timedelta(days=settings.outbox_retention_days), settings.outbox_purge_batch_size)
+    purged_total = 0
+    while True:
+        async with async_session() as session:
+            purged = len((await session.execute(statement)).all())
+            await session.commit()
+        purged_total += purged
+        # Строки outbox только вставляются, никто их не держит: неполная пачка - последняя
+        if purged < settings.outbox_purge_batch_size:
+            logger.info("Удалено старых изменений из outbox: %s", purged_total)
+            return purged_total
+
+
+async def purge_old_changes_forever():
+    """
+        Фоновая задача приложения: очистка раз в outbox_purge_interval секунд.
+    """
+    while True:
+        try:
+            await purge_old_changes()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Ошибка очистки outbox")
+        await asyncio.sleep(get_settings().outbox_purge_interval)
+
+
+async def _run_cli():
+    try:
+        print(await purge_old_changes())
+    finally:
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_cli())
@@ -0,0 +1,80 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.notifications import listener, wait_for_event
+from core.session import get_db, get_settings, async_session
+from src.changes.outbox import START_CURSOR, CURSOR_PATTERN, read_changes
+from src.changes.schemas import ChangePage
+from src.dependencies.authentication import get_token_payload
+from src.user.schemas import UserTokenPayload
+
+router = APIRouter(dependencies=[Depends(get_token_payload)])
+
+OUTBOX_CHANNEL = "outbox"
+
+
+@router.get(
+    "/kitty/changes",
+    response_model=ChangePage,
+    description="Лента изменений котят текущего пользователя и пород после курсора since. "
+                "Для следующей страницы передайте next_cursor из ответа.",
+    summary="Лента изменений.",
+    responses={
+        200: {"description": "Успешный запрос."},
+        500: {
+            "description": "Ошибка запроса",
+        },
+    }
+)
+async def get_changes(
+        since: str = Query(START_CURSOR, pattern=CURSOR_PATTERN),
+        limit: Optional[int] = Query(None, ge=1, le=1000),
+        entity: Optional[str] = None,
+        token_payload: UserTokenPayload = Depends(get_token_payload),
+        db_connect: AsyncSession = Depends(get_db),
+):
+    return await read_changes(
+        db_connect, since, limit or get_settings().changes_page_size, token_payload.user_id, entity
+    )
+
+
+@router.get(
+    "/kitty/changes/stream",
+    description="Поток изменений котят текущего пользователя и пород в формате Server-Sent Events. "
+                "После переподключения поток продолжается с Last-Event-ID.",
+    summary="Поток изменений (SSE).",
+    responses={
+        200: {"description": "Поток открыт."},
+    }
+)
+async def stream_changes(
+        since: str = Query(START_CURSOR, pattern=CURSOR_PATTERN),
+        entity: Optional[str] = None,
+        last_event_id: Optional[str] = Header(None, pattern=CURSOR_PATTERN),
+        token_payload: UserTokenPayload = Depends(get_token_payload),
+):
+    return StreamingResponse(
+        _change_events(last_event_id or since, token_payload.user_id, entity),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _change_events(cursor: str, owner_id: int, entity: Optional[str]):
+    settings = get_settings()
+    async with listener.subscription(OUTBOX_CHANNEL) as notified:
+        while True:
+            notified.clear()
+            # Сессия берется на один опрос, чтобы открытый поток не держал соединение пула
+            async with async_session() as session:
+                page = await read_changes(session, cursor, settings.changes_page_size, owner_id, entity)
+            for change in page.changes:
+                yield f"id: {change.cursor}\nevent: {change.operation}\ndata: {change.model_dump_json()}\n\n"
+            cursor = page.next_cursor
+            if len(page.changes) == settings.changes_page_size:
+                continue
+            if not await wait_for_event(notified, settings.changes_poll_interval):
+                yield ": keep-alive\n\n"
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+
+class ChangeOut(BaseModel):
+    cursor: str
+    entity: str
+    entity_id: int
+    operation: str
+    payload: dict
+    created_at: datetime
+
+
+class ChangePage(BaseModel):
+    changes: List[ChangeOut]
+    next_cursor: str
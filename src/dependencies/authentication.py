@@ -1,28 +1,32 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError, ExpiredSignatureError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core import tracing
 from core.session import get_db, get_settings
 from core.settings import AppSettings
 from database.models import User
+from src.user.auth import decode_token_once, TokenError, TokenExpiredError
 from src.user.schemas import UserTokenPayload
 
 security = HTTPBearer()
 
 
 async def get_token_payload(
+        request: Request,
         authorization: HTTPAuthorizationCredentials = Depends(security),
         settings: AppSettings = Depends(get_settings)
 ):
     token = authorization.credentials
-    try:
-        payload = jwt.decode(token, settings.jwt_key, algorithms=settings.jwt_algorithm)
-    except ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Не валидный токен")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Срок жизни токена истек")
+    with tracing.span("auth.token"):
+        try:
+            # Если токен уже проверил middleware, берется его результат
+            payload = decode_token_once(request.scope, token, settings)
+        except TokenExpiredError:
+            raise HTTPException(status_code=401, detail="Срок жизни токена истек")
+        except TokenError:
+            raise HTTPException(status_code=401, detail="Не валидный токен")
 
     return UserTokenPayload(**payload)
 
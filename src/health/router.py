@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Request
+
+router = APIRouter()
+
+
+@router.get(
+    "/health/live",
+    description="Проверка, что процесс жив.",
+    summary="Проверка, что процесс жив.",
+    responses={
+        200: {"description": "Процесс жив."},
+    }
+)
+async def live():
+    return {"status": "ok"}
+
+
+@router.get(
+    "/health/ready",
+    description="Проверка готовности принимать трафик (прогрев завершен).",
+    summary="Проверка готовности принимать трафик.",
+    responses={
+        200: {"description": "Приложение готово."},
+        503: {
+            "description": "Прогрев еще не завершен",
+        },
+    }
+)
+async def ready(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Прогрев еще не завершен")
+    return {"status": "ready"}
+
+
+@router.get(
+    "/health/metrics",
+    description="Показатели воркера: запросы к БД в работе, длина очереди и число отказов.",
+    summary="Показатели воркера.",
+    responses={
+        200: {"description": "Успешный запрос."},
+    }
+)
+async def metrics(request: Request):
+    admission = getattr(request.app.state, "admission", None)
+    return {"admission": admission.gauges() if admission else None}
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.kitty.bulk import apply_bulk, patch_values, import_kittens
+from src.kitty.schemas import KittyBulkIn
+
+
+def _owner(user_id: Optional[int]) -> int:
+    # Котята задачи - котята ее автора; без автора (он архивирован) задача ничего не трогает
+    if user_id is None:
+        raise LookupError("Автор задачи удален")
+    return user_id
+
+
+async def kitty_bulk_update(db_connect: AsyncSession, payload: dict, user_id: Optional[int]) -> dict:
+    bulk_in = KittyBulkIn.Update.model_validate(payload)
+    result = await apply_bulk(db_connect, bulk_in, patch_values(bulk_in.patch), "update", _owner(user_id))
+    return result.model_dump(mode="json")
+
+
+async def kitty_bulk_delete(db_connect: AsyncSession, payload: dict, user_id: Optional[int]) -> dict:
+    bulk_in = KittyBulkIn.Delete.model_validate(payload)
+    result = await apply_bulk(db_connect, bulk_in, {"deleted_at": datetime.now()}, "delete", _owner(user_id))
+    return result.model_dump(mode="json")
+
+
+async def kitty_import(db_connect: AsyncSession, payload: dict, user_id: Optional[int]) -> dict:
+    import_in = KittyBulkIn.Import.model_validate(payload)
+    result = await import_kittens(db_connect, import_in.kittens, _owner(user_id))
+    return result.model_dump(mode="json")
+
+
+JOB_HANDLERS: Dict[str, Callable[[AsyncSession, dict, Optional[int]], Awaitable[dict]]] = {
+    "kitty_bulk_update": kitty_bulk_update,
+    "kitty_bulk_delete": kitty_bulk_delete,
+    "kitty_import": kitty_import,
+}
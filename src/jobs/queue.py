@@ -0,0 +1,100 @@
+"""
+    Очередь задач на таблице jobs.
+
+    Задача забирается одним UPDATE ... WHERE id = (SELECT ... FOR UPDATE
+    SKIP LOCKED LIMIT 1) RETURNING, поэтому несколько воркеров не ждут
+    друг друга и не берут одну задачу дважды. Вставка в jobs шлет NOTIFY
+    в канал jobs, и воркер просыпается сразу, а не по таймеру.
+"""
+from datetime import timedelta
+from typing import Optional
+
+import sqlalchemy as sa
+from pydantic import BaseModel
+from sqlalchemy import select, update, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.session import get_settings
+from database.models import Job
+
+JOB_CHANNEL = "jobs"
+DB_NOW = sa.func.timezone("utc", sa.func.now())
+
+
+async def enqueue(db_connect: AsyncSession, kind: str, payload: BaseModel, user_id: Optional[int] = None) -> Job:
+    job = Job(
+        kind=kind,
+        payload=payload.model_dump(mode="json"),
+        max_attempts=get_settings().job_max_attempts,
+        user_id=user_id,
+    )
+    db_connect.add(job)
+    await db_connect.flush()
+    await db_connect.refresh(job)
+    return job
+
+
+def claim_statement():
+    """
+        Переводит в running первую готовую задачу: из queued, у которой
+        подошел run_after, или брошенную в running дольше job_lock_timeout.
+    """
+    next_job = (
+        select(Job.id)
+        .where(or_(
+            and_(Job.status == "queued", Job.run_after <= DB_NOW),
+            and_(
+                Job.status == "running",
+                Job.locked_at < DB_NOW - timedelta(seconds=get_settings().job_lock_timeout),
+            ),
+        ))
+        .order_by(Job.run_after, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(Job)
+        .where(Job.id == next_job)
+        .values(status="running", attempts=Job.attempts + 1, locked_at=DB_NOW, updated_at=DB_NOW)
+        .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts, Job.user_id)
+    )
+
+
+def _owned(claimed):
+    # Задачу могли забрать повторно после job_lock_timeout: тогда attempts уже другой
+    return and_(Job.id == claimed.id, Job.status == "running", Job.attempts == claimed.attempts)
+
+
+def complete_statement(claimed, result: dict):
+    return (
+        update(Job)
+        .where(_owned(claimed))
+        .values(status="done", result=result, error=None, locked_at=None, updated_at=DB_NOW)
+    )
+
+
+def fail_statement(claimed, error: str):
+    """
+        Возвращает задачу в очередь с экспоненциальной паузой
+        или помечает failed, если попытки кончились.
+    """
+    if claimed.attempts >= claimed.max_attempts:
+        values = {"status": "failed"}
+    else:
+        backoff = get_settings().job_retry_backoff * 2 ** (claimed.attempts - 1)
+        values = {"status": "queued", "run_after": DB_NOW + timedelta(seconds=backoff)}
+    return (
+        update(Job)
+        .where(_owned(claimed))
+        .values(**values, error=error, locked_at=None, updated_at=DB_NOW)
+    )
+
+
+def release_statement(claimed):
+    # Воркер остановили посреди задачи: попытка не засчитывается
+    return (
+        update(Job)
+        .where(_owned(claimed))
+        .values(status="queued", attempts=Job.attempts - 1, locked_at=None, updated_at=DB_NOW)
+    )
@@ -0,0 +1,130 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.session import get_db
+from database.models import Job
+from src.dependencies.authentication import get_token_payload
+from src.jobs.queue import enqueue
+from src.jobs.schemas import JobOut
+from src.kitty.bulk import patch_values
+from src.kitty.schemas import KittyBulkIn
+from src.user.schemas import UserTokenPayload
+
+router = APIRouter(dependencies=[Depends(get_token_payload)])
+
+
+def _job_out(job: Job) -> JobOut:
+    return JobOut(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        attempts=job.attempts,
+        max_attempts=job.max_attempts,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+@router.post(
+    "/jobs/kitty/bulk-update",
+    response_model=JobOut,
+    status_code=202,
+    description="Постановка массового изменения котят в очередь. "
+                "Результат - в GET /jobs/{job_id} по id задачи.",
+    summary="Массовое изменение котят в фоне.",
+    responses={
+        202: {"description": "Задача поставлена в очередь."},
+        400: {
+            "description": "Нет полей для изменения",
+        },
+        500: {
+            "description": "Ошибка постановки задачи",
+        },
+    }
+)
+async def enqueue_kitty_bulk_update(
+        bulk_in: KittyBulkIn.Update,
+        token_payload: UserTokenPayload = Depends(get_token_payload),
+        db_connect: AsyncSession = Depends(get_db),
+):
+    if not patch_values(bulk_in.patch):
+        raise HTTPException(status_code=400, detail="Нет полей для изменения")
+    return _job_out(await enqueue(db_connect, "kitty_bulk_update", bulk_in, token_payload.user_id))
+
+
+@router.post(
+    "/jobs/kitty/bulk-delete",
+    response_model=JobOut,
+    status_code=202,
+    description="Постановка массового мягкого удаления котят в очередь. "
+                "Результат - в GET /jobs/{job_id} по id задачи.",
+    summary="Массовое удаление котят в фоне.",
+    responses={
+        202: {"description": "Задача поставлена в очередь."},
+        500: {
+            "description": "Ошибка постановки задачи",
+        },
+    }
+)
+async def enqueue_kitty_bulk_delete(
+        bulk_in: KittyBulkIn.Delete,
+        token_payload: UserTokenPayload = Depends(get_token_payload),
+        db_connect: AsyncSession = Depends(get_db),
+):
+    return _job_out(await enqueue(db_connect, "kitty_bulk_delete", bulk_in, token_payload.user_id))
+
+
+@router.post(
+    "/jobs/kitty/import",
+    response_model=JobOut,
+    status_code=202,
+    description="Постановка импорта списка котят в очередь. "
+                "Id созданных котят - в результате GET /jobs/{job_id}.",
+    summary="Импорт котят в фоне.",
+    responses={
+        202: {"description": "Задача поставлена в очередь."},
+        500: {
+            "description": "Ошибка постановки задачи",
+        },
+    }
+)
+async def enqueue_kitty_import(
+        import_in: KittyBulkIn.Import,
+        token_payload: UserTokenPayload = Depends(get_token_payload),
+        db_connect: AsyncSession = Depends(get_db),
+):
+    return _job_out(await enqueue(db_connect, "kitty_import", import_in, token_payload.user_id))
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobOut,
+    description="Статус задачи из очереди: queued, running, done или failed. "
+                "Для done в result - итог, для failed в error - последняя ошибка.",
+    summary="Статус задачи.",
+    responses={
+        200: {"description": "Успешный запрос."},
+        404: {
+            "description": "Нет задачи с таким id",
+        },
+        500: {
+            "description": "Ошибка запроса",
+        },
+    }
+)
+async def get_job(
+        job_id: int,
+        token_payload: UserTokenPayload = Depends(get_token_payload),
+        db_connect: AsyncSession = Depends(get_db),
+):
+    job = (
+        await db_connect.execute(
+            select(Job).filter(and_(Job.id == job_id, Job.user_id == token_payload.user_id))
+        )
+    ).scalar()
+    if not job:
+        raise HTTPException(status_code=404, detail="Нет задачи с таким id")
+    return _job_out(job)
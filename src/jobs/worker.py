@@ -0,0 +1,95 @@
+"""
+    Воркер очереди задач.
+
+    Запуск отдельным процессом:
+        python -m src.jobs.worker --concurrency 2
+
+    или в фоне приложения (job_worker_enabled=True).
+"""
+import argparse
+import asyncio
+import logging
+from contextlib import suppress
+
+from core.notifications import listener, wait_for_event
+from core.session import async_session, get_settings, get_engine
+from src.jobs.handlers import JOB_HANDLERS
+from src.jobs.queue import JOB_CHANNEL, claim_statement, complete_statement, fail_statement, release_statement
+
+logger = logging.getLogger(__name__)
+
+
+async def run_next_job() -> bool:
+    """
+        Забирает и выполняет одну задачу. Работа задачи и отметка done
+        коммитятся одной транзакцией. Возвращает False, если задач нет.
+    """
+    async with async_session() as session:
+        claimed = (await session.execute(claim_statement())).one_or_none()
+        await session.commit()
+    if claimed is None:
+        return False
+
+    try:
+        handler = JOB_HANDLERS.get(claimed.kind)
+        if handler is None:
+            raise LookupError(f"Неизвестный тип задачи: {claimed.kind}")
+        async with async_session() as session:
+            result = await handler(session, claimed.payload, claimed.user_id)
+            if (await session.execute(complete_statement(claimed, result))).rowcount:
+                await session.commit()
+            else:
+                await session.rollback()
+                logger.warning("Задача %s забрана другим воркером, результат отброшен", claimed.id)
+    except asyncio.CancelledError:
+        async with async_session() as session:
+            await asyncio.shield(session.execute(release_statement(claimed)))
+            await asyncio.shield(session.commit())
+        raise
+    except Exception as error:
+        logger.exception("Ошибка задачи %s (%s), попытка %s", claimed.id, claimed.kind, claimed.attempts)
+        async with async_session() as session:
+            await session.execute(fail_statement(claimed, f"{type(error).__name__}: {error}"))
+            await session.commit()
+    return True
+
+
+async def work_forever():
+    """
+        Цикл воркера: выполняет задачи, пока они есть, потом ждет NOTIFY
+        в канал jobs или job_poll_interval секунд (для отложенных повторов).
+    """
+    async with listener.subscription(JOB_CHANNEL) as notified:
+        while True:
+            notified.clear()
+            try:
+                if await run_next_job():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Ошибка очереди задач")
+            await wait_for_event(notified, get_settings().job_poll_interval)
+
+
+async def _run_cli(concurrency: int):
+    workers = [asyncio.create_task(work_forever()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await worker
+        await listener.close()
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Воркер очереди задач.")
+    parser.add_argument("--concurrency", type=int, default=get_settings().job_worker_concurrency)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_run_cli(args.concurrency))
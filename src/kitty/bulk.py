@@ -0,0 +1,152 @@
+"""
+    Массовые операции над котятами: используются и роутером, и задачами
+    из очереди (src.jobs).
+"""
+from typing import List
+
+from sqlalchemy import select, insert, update, and_, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.session import get_settings
+from database.models import Kitty
+from src.changes.outbox import record_changes
+from src.kitty.schemas import KittyOut, KittyIn, KittyFilter, KittyBulkIn, KittyBulkOut, KittyImportOut
+
+KITTY_OUT_COLUMNS = [Kitty.__table__.c[name] for name in KittyOut.model_fields]
+
+
+def chunks(items: List, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def ids_param(ids: List[int]):
+    return bindparam("ids", ids, type_=ARRAY(Integer))
+
+
+async def apply_by_ids(
+        db_connect: AsyncSession, ids: List[int], values: dict, operation: str, owner_id: int
+) -> KittyBulkOut:
+    """
+        Применяет values к живым котятам владельца owner_id из ids пачками по
+        bulk_chunk_size одним UPDATE ... RETURNING на пачку и пишет изменения
+        в outbox. Для id, которые не обновились, одним SELECT на пачку
+        определяет: котенок удален или не существует (чужие - не существуют).
+    """
+    chunk_size = get_settings().bulk_chunk_size
+    requested_ids = list(dict.fromkeys(ids))
+
+    updated = set()
+    for chunk in chunks(requested_ids, chunk_size):
+        kittens = (
+            await db_connect.execute(
+                update(Kitty)
+                .where(and_(
+                    Kitty.id == any_(ids_param(chunk)), Kitty.owner_id == owner_id, Kitty.deleted_at == None
+                ))
+                .values(**values, version=Kitty.version + 1)
+                .returning(*KITTY_OUT_COLUMNS)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        await record_changes(
+            db_connect, "kitty", operation, [KittyOut(**kitty._mapping) for kitty in kittens], owner_id
+        )
+        updated.update(kitty.id for kitty in kittens)
+
+    missed_ids = [kitty_id for kitty_id in requested_ids if kitty_id not in updated]
+    existing = set()
+    for chunk in chunks(missed_ids, chunk_size):
+        existing.update((
+            await db_connect.execute(
+                select(Kitty.id).filter(and_(Kitty.id == any_(ids_param(chunk)), Kitty.owner_id == owner_id))
+            )
+        ).scalars().all())
+
+    return KittyBulkOut(
+        updated=[kitty_id for kitty_id in requested_ids if kitty_id in updated],
+        not_found=[kitty_id for kitty_id in missed_ids if kitty_id not in existing],
+        already_deleted=[kitty_id for kitty_id in missed_ids if kitty_id in existing],
+    )
+
+
+async def apply_by_filter(
+        db_connect: AsyncSession, kitty_filter: KittyFilter, values: dict, operation: str, owner_id: int
+) -> KittyBulkOut:
+    """
+        Применяет values к живым котятам владельца owner_id под фильтром
+        пачками по bulk_chunk_size.
+        Пачки идут по возрастанию id (keyset), поэтому изменение полей из фильтра
+        не приводит к повторной обработке строк. Условия фильтра повторяются
+        в самом UPDATE, чтобы Postgres отсек лишние секции kittens.
+        Неполная пачка не значит, что строки кончились (часть выбранных могли
+        изменить параллельно), поэтому цикл заканчивается только на пустой.
+    """
+    chunk_size = get_settings().bulk_chunk_size
+    conditions = [Kitty.owner_id == owner_id, Kitty.deleted_at == None]
+    for key, value in kitty_filter.dict(exclude_none=True).items():
+        conditions.append(getattr(Kitty, key) == value)
+
+    updated = []
+    last_id = 0
+    while True:
+        chunk_ids = (
+            select(Kitty.id)
+            .filter(and_(*conditions, Kitty.id > last_id))
+            .order_by(Kitty.id)
+            .limit(chunk_size)
+            .scalar_subquery()
+        )
+        kittens = (
+            await db_connect.execute(
+                update(Kitty)
+                .where(and_(Kitty.id.in_(chunk_ids), *conditions))
+                .values(**values, version=Kitty.version + 1)
+                .returning(*KITTY_OUT_COLUMNS)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        if not kittens:
+            break
+        await record_changes(
+            db_connect, "kitty", operation, [KittyOut(**kitty._mapping) for kitty in kittens], owner_id
+        )
+        chunk_updated = [kitty.id for kitty in kittens]
+        updated.extend(chunk_updated)
+        last_id = max(chunk_updated)
+
+    return KittyBulkOut(updated=sorted(updated), not_found=[], already_deleted=[])
+
+
+def patch_values(patch: KittyIn.Update) -> dict:
+    return {key: value for key, value in patch.dict(exclude_unset=True).items() if value is not None}
+
+
+async def apply_bulk(
+        db_connect: AsyncSession, bulk_in: KittyBulkIn.Delete, values: dict, operation: str, owner_id: int
+) -> KittyBulkOut:
+    if bulk_in.ids is not None:
+        return await apply_by_ids(db_connect, bulk_in.ids, values, operation, owner_id)
+    return await apply_by_filter(db_connect, bulk_in.filter, values, operation, owner_id)
+
+
+async def import_kittens(db_connect: AsyncSession, kittens: List[KittyIn.Create], owner_id: int) -> KittyImportOut:
+    """
+        Добавляет котят владельца owner_id пачками по bulk_chunk_size одним
+        INSERT ... RETURNING на пачку и пишет их в outbox.
+    """
+    created = []
+    for chunk in chunks(kittens, get_settings().bulk_chunk_size):
+        rows = (
+            await db_connect.execute(
+                insert(Kitty)
+                .values([kitty.dict() | {"owner_id": owner_id} for kitty in chunk])
+                .returning(*KITTY_OUT_COLUMNS)
+            )
+        ).all()
+        await record_changes(
+            db_connect, "kitty", "create", [KittyOut(**kitty._mapping) for kitty in rows], owner_id
+        )
+        created.extend(kitty.id for kitty in rows)
+    return KittyImportOut(created=created)
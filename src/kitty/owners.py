@@ -0,0 +1,100 @@
+"""
+    Передача котят без владельца (owner_id IS NULL) пользователю.
+
+    Без владельца остаются котята архивированных пользователей (ON DELETE
+    SET NULL); котят, созданных до появления owner_id, передает миграция.
+    Такие котята не видны через API, пока их не передадут владельцу:
+    разово из командной строки или автоматически после архивации, если задан
+    kitty_orphan_owner.
+
+    Пример:
+        python -m src.kitty.owners --owner admin
+"""
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import select, update
+
+from core.session import async_session, get_settings, get_engine
+from database.models import Kitty, User
+
+logger = logging.getLogger(__name__)
+
+
+class OwnerNotFoundError(LookupError):
+    """Нет живого пользователя, которому передаются котята."""
+
+
+async def find_owner_id(username: str) -> int:
+    async with async_session() as session:
+        owner_id = (await session.execute(
+            select(User.id).filter(User.username == username, User.deleted_at == None)
+        )).scalar()
+    if owner_id is None:
+        raise OwnerNotFoundError(f"Нет пользователя {username}")
+    return owner_id
+
+
+def assign_batch_statement(owner_id: int, batch_size: int):
+    """
+        Один батч: UPDATE котят без владельца по возрастанию id. Строки,
+        заблокированные другими транзакциями, пропускаются (SKIP LOCKED),
+        версия увеличивается - у котенка сменился тот, кто может его менять.
+    """
+    orphan_ids = (
+        select(Kitty.id)
+        .filter(Kitty.owner_id == None)
+        .order_by(Kitty.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(Kitty)
+        .where(Kitty.id.in_(orphan_ids.scalar_subquery()), Kitty.owner_id == None)
+        .values(owner_id=owner_id, version=Kitty.version + 1)
+        .returning(Kitty.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def assign_orphans(owner_id: int, batch_size: Optional[int] = None) -> int:
+    """
+        Передает всех котят без владельца пользователю owner_id пачками,
+        каждая пачка - отдельная транзакция. Возвращает число котят.
+    """
+    settings = get_settings()
+    batch_size = batch_size or settings.kitty_backfill_batch_size
+    assigned_total = 0
+    while True:
+        async with async_session() as session:
+            assigned = len((await session.execute(assign_batch_statement(owner_id, batch_size))).all())
+            await session.commit()
+        assigned_total += assigned
+        logger.info("Котята без владельца: передано %s (всего %s)", assigned, assigned_total)
+        # Короткая пачка еще не значит конец: часть строк могла быть заблокирована
+        if not assigned:
+            return assigned_total
+        if settings.kitty_backfill_pause:
+            await asyncio.sleep(settings.kitty_backfill_pause)
+
+
+async def _run_cli(owner: str, batch_size: Optional[int]):
+    try:
+        print(f"kittens: {await assign_orphans(await find_owner_id(owner), batch_size)}")
+    finally:
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Передача котят без владельца пользователю.")
+    parser.add_argument("--owner", default=None, help="username, по умолчанию kitty_orphan_owner")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    owner = args.owner or get_settings().kitty_orphan_owner
+    if not owner:
+        parser.error("Укажите --owner или kitty_orphan_owner")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_cli(owner, args.batch_size))
@@ -1,19 +1,62 @@
+import html
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, and_
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
+from pydantic import TypeAdapter
+import sqlalchemy as sa
+from sqlalchemy import select, and_, any_, bindparam, func, tuple_, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, REAL
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
-from core.session import get_db
-from database.models import Kitty
+from core.session import get_db, get_settings, traced_session
+from database.models import Kitty, Breed, KITTY_SEARCH_CONFIG
 from src.breed.schemas import BreedOut
+from src.changes.outbox import record_change
+from src.user.schemas import UserTokenPayload
+from src.kitty.bulk import KITTY_OUT_COLUMNS, apply_bulk, patch_values
 from src.dependencies.authentication import get_token_payload
-from src.kitty.schemas import KittyOut, KittyIn, KittyOutWithBreed, KittyOutList
+from src.streaming import json_list_response
+from src.kitty.schemas import (
+    KittyOut, KittyIn, KittyOutWithBreed, KittyOutList, KittyOutBatch, KittyBulkIn, KittyBulkOut,
+    KittySearchHit, KittySearchOut
+)
 
 router = APIRouter(dependencies=[Depends(get_token_payload)])
 
+KITTY_BATCH_LIMIT = 200
+KITTY_LIST_ADAPTER = TypeAdapter(List[KittyOut])
+KITTY_SEARCH_CURSOR = r"^[0-9.e+-]+:\d+$"
+SEARCH_CONFIG = sa.literal_column(f"'{KITTY_SEARCH_CONFIG}'::regconfig")
+# Маркеры подсветки из управляющих символов: текст экранируется как HTML,
+# и только потом маркеры заменяются на <mark>
+HIGHLIGHT_START, HIGHLIGHT_STOP = "\x02", "\x03"
+NAME_HIGHLIGHT = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, HighlightAll=true"
+DESCRIPTION_HIGHLIGHT = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxFragments=2, MaxWords=20, MinWords=5"
+
+
+def _kitty_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _if_match_allows(if_match: Optional[str], version: int) -> bool:
+    """
+        Проверка If-Match: "*" или список ETag. Сравнение сильное (RFC 9110):
+        слабый W/"..." не совпадает ни с какой версией.
+    """
+    if if_match is None:
+        return True
+    tags = [tag.strip() for tag in if_match.split(",")]
+    return "*" in tags or _kitty_etag(version) in tags
+
+
+def _highlight(text: Optional[str]) -> Optional[str]:
+    if text is None:
+        return None
+    return html.escape(text).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
 
 @router.post(
     "/kitty/create/",
@@ -29,6 +72,7 @@ router = APIRouter(dependencies=[Depends(get_token_payload)])
 )
 async def create_ketty(
         kitty_in: KittyIn.Create,
+        token_payload: UserTokenPayload = Depends(get_token_payload),
         db_connect: AsyncSession = Depends(get_db),
 ):
     kitty_data = kitty_in.dict()
@@ -38,11 +82,12 @@ async def create_ketty(
         age=kitty_data['age'],
         description=kitty_data['description'],
         breed_id=kitty_data['breed_id'],
+        owner_id=token_payload.user_id,
     )
     db_connect.add(kitty_add)
     await db_connect.flush()
     await db_connect.refresh(kitty_add)
-    return KittyOut(
+    kitty_out = KittyOut(
         created_at=kitty_add.created_at,
         updated_at=kitty_add.updated_at,
         deleted_at=kitty_add.deleted_at,
@@ -53,12 +98,156 @@ async def create_ketty(
         description=kitty_add.description,
         breed_id=kitty_add.breed_id,
     )
+    record_change(db_connect, "kitty", "create", kitty_out, token_payload.user_id)
+    return kitty_out
+
+
+@router.get(
+    "/kitty/batch",
+    response_model=KittyOutBatch,
+    description="Получение информации о нескольких котятах текущего пользователя по списку id "
+                "одним запросом. Порядок ответа совпадает с порядком id в запросе, чужие и "
+                "удаленные котята попадают в missing_ids.",
+    summary="Получение информации о нескольких котятах.",
+    responses={
+        200: {"description": "Успешный запрос."},
+        500: {
+            "description": "Ошибка запроса",
+        },
+    }
+)
+async def get_kitty_batch(
+        ids: List[int] = Query(..., min_length=1, max_length=KITTY_BATCH_LIMIT),
+        token_payload: UserTokenPayload = Depends(get_token_payload),
+        db_connect: AsyncSession = Depends(get_db),
+):
+    requested_ids = list(dict.fromkeys(ids))
+    rows = (
+        await db_connect.execute(
+            select(Kitty, Breed)
+            .join(Breed, Kitty.breed_id == Breed.id)
+            .filter(
+                and_(
+                    Kitty.id == any_(bindparam("ids", requested_ids, type_=ARRAY(Integer))),
+                    Kitty.owner_id == token_payload.user_id,
+                    Kitty.deleted_at == None,
+                )
+            )
+        )
+    ).all()
+    found = {
+        kitty.id: KittyOutWithBreed(
+            kitty=KittyOut(
+                created_at=kitty.created_at,
+                updated_at=kitty.updated_at,
+                deleted_at=kitty.deleted_at,
+                id=kitty.id,
+                name=kitty.name,
+                color=kitty.color,
+                age=kitty.age,
+                description=kitty.description,
+                breed_id=kitty.breed_id,
+            ),
+            breed=BreedOut(
+                id=breed.id,
+                name=breed.name,
+                description=breed.description,
+            )
+        ) for kitty, breed in rows
+    }
+    return KittyOutBatch(
+        kittens=[found[kitty_id] for kitty_id in requested_ids if kitty_id in found],
+        missing_ids=[kitty_id for kitty_id in requested_ids if kitty_id not in found],
+    )
+
+
+@router.get(
+    "/kitty/search",
+    response_model=KittySearchOut,
+    description="Полнотекстовый поиск котят текущего пользователя по имени и описанию. Запрос q понимает "
+                "\"фразы в кавычках\", or и -исключение. Результаты отсортированы по "
+                "релевантности, совпадения выделены <mark>. Для следующей страницы "
+                "передайте next_cursor из ответа.",
+    summary="Поиск котят.",
+    responses={
+        200: {"description": "Успешный запрос."},
+        400: {
+            "description": "Невалидный курсор",
+        },
+        500: {
+            "description": "Ошибка запроса",
+        },
+    }
+)
+async def search_kitty(
+        q: str = Query(..., min_length=1, max_length=200),
+        limit: Optional[int] = Query(None, ge=1, le=100),
+        cursor: Optional[str] = Query(None, pattern=KITTY_SEARCH_CURSOR),
+        token_payload: UserTokenPayload = Depends(get_token_payload),
+        db_connect: AsyncSession = Depends(get_db),
+):
+    limit = limit or get_settings().kitty_search_page_size
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(Kitty.search_vector, ts_query, type_=REAL)
+    conditions = [
+        Kitty.search_vector.op("@@")(ts_query), Kitty.owner_id == token_payload.user_id, Kitty.deleted_at == None
+    ]
+    if cursor is not None:
+        last_rank, last_id = cursor.split(":")
+        try:
+            last_rank = float(last_rank)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Невалидный курсор")
+        # Keyset по (rank, id): rank приходит из real, поэтому сравнивается тоже как real
+        conditions.append(tuple_(rank, Kitty.id) < tuple_(sa.cast(last_rank, REAL), int(last_id)))
+
+    # Подсветка дорогая, поэтому считается только для строк страницы
+    page = (
+        select(*KITTY_OUT_COLUMNS, rank.label("rank"))
+        .filter(and_(*conditions))
+        .order_by(rank.desc(), Kitty.id.desc())
+        .limit(limit)
+        .subquery()
+    )
+    rows = (
+        await db_connect.execute(
+            select(
+                page,
+                func.ts_headline(SEARCH_CONFIG, page.c.name, ts_query, NAME_HIGHLIGHT).label("name_highlight"),
+                func.ts_headline(
+                    SEARCH_CONFIG, page.c.description, ts_query, DESCRIPTION_HIGHLIGHT
+                ).label("description_highlight"),
+            )
+            .order_by(page.c.rank.desc(), page.c.id.desc())
+        )
+    ).all()
+    return KittySearchOut(
+        hits=[
+            KittySearchHit(
+                kitty=KittyOut(
+                    created_at=row.created_at,
+                    updated_at=row.updated_at,
+                    deleted_at=row.deleted_at,
+                    id=row.id,
+                    name=row.name,
+                    color=row.color,
+                    age=row.age,
+                    description=row.description,
+                    breed_id=row.breed_id,
+                ),
+                rank=row.rank,
+                name_highlight=_highlight(row.name_highlight),
+                description_highlight=_highlight(row.description_highlight),
+            ) for row in rows
+        ],
+        next_cursor=f"{rows[-1].rank!r}:{rows[-1].id}" if len(rows) == limit else None,
+    )
 
 
 @router.get(
     "/kitty/{kitty_id}",
     response_model=KittyOutWithBreed,
-    description="Получения информации о конкретной котенке.",
+    description="Получения информации о конкретном котенке текущего пользователя.",
     summary="Получения информации о конкретной котенке.",
     responses={
         200: {"description": "Успешный запрос."},
@@ -72,13 +261,15 @@ async def create_ketty(
 )
 async def get_kitty(
         kitty_id: int,
+        response: Response,
+        token_payload: UserTokenPayload = Depends(get_token_payload),
         db_connect: AsyncSession = Depends(get_db),
 ):
     kitty = (
         await db_connect.execute(
             select(Kitty)
             .filter(
-                and_(Kitty.id == kitty_id, Kitty.deleted_at == None)
+                and_(Kitty.id == kitty_id, Kitty.owner_id == token_payload.user_id, Kitty.deleted_at == None)
             )
             .options(
                 selectinload(Kitty.breed)
@@ -87,6 +278,7 @@ async def get_kitty(
     ).scalar()
     if not kitty:
         raise HTTPException(status_code=404, detail="Нет котенка с таким id")
+    response.headers["ETag"] = _kitty_etag(kitty.version)
     return KittyOutWithBreed(
         kitty=KittyOut(
             created_at=kitty.created_at,
@@ -110,8 +302,8 @@ async def get_kitty(
 @router.get(
     "/kitty/all/",
     response_model=KittyOutList,
-    description="Получения информации о всех котятах.",
-    summary="Получения информации о всех котятах.",
+    description="Получения информации о всех котятах текущего пользователя, по возрастанию id.",
+    summary="Получения информации о всех котятах пользователя.",
     responses={
         200: {"description": "Успешный запрос."},
         500: {
@@ -121,37 +313,48 @@ async def get_kitty(
 )
 async def get_all_kitty(
         breed_id: Optional[int] = None,
-        db_connect: AsyncSession = Depends(get_db),
+        token_payload: UserTokenPayload = Depends(get_token_payload),
 ):
-    query = select(Kitty).filter(Kitty.deleted_at == None)
+    # Владелец берется из токена, без запроса к user; порядок по id читается из ix_kittens_owner_id_id
+    query = (
+        select(Kitty)
+        .filter(and_(Kitty.owner_id == token_payload.user_id, Kitty.deleted_at == None))
+        .order_by(Kitty.id)
+    )
 
     if breed_id is not None:
         query = query.filter(Kitty.breed_id == breed_id)
 
-    result = await db_connect.execute(query)
-    kittens = result.scalars().all()
+    return await json_list_response("kittens", _kitty_partitions(query), KITTY_LIST_ADAPTER)
 
-    kittens_out_list = [
-        KittyOut(
-            created_at=kitty.created_at,
-            updated_at=kitty.updated_at,
-            deleted_at=kitty.deleted_at,
-            id=kitty.id,
-            name=kitty.name,
-            color=kitty.color,
-            age=kitty.age,
-            description=kitty.description,
-            breed_id=kitty.breed_id
-        ) for kitty in kittens
-    ]
 
-    return KittyOutList(kittens=kittens_out_list)
+async def _kitty_partitions(query):
+    # Ответ потоковый, поэтому сессия живет, пока отдается тело, а не пока работает обработчик
+    async with traced_session() as session:
+        result = await session.stream_scalars(
+            query.execution_options(yield_per=get_settings().stream_partition_size)
+        )
+        async for kittens in result.partitions():
+            yield [
+                KittyOut(
+                    created_at=kitty.created_at,
+                    updated_at=kitty.updated_at,
+                    deleted_at=kitty.deleted_at,
+                    id=kitty.id,
+                    name=kitty.name,
+                    color=kitty.color,
+                    age=kitty.age,
+                    description=kitty.description,
+                    breed_id=kitty.breed_id
+                ) for kitty in kittens
+            ]
 
 
 @router.put(
     "/kitty/update/{kitty_id}",
     response_model=KittyOut,
-    description="Изменение информации о котенке.",
+    description="Изменение информации о котенке. Если передан If-Match с ETag из "
+                "GET /kitty/{kitty_id}, изменение применится, только если котенка с тех пор не меняли.",
     summary="Изменение информации о котенке.",
     responses={
         200: {"description": "Информация изменена."},
@@ -161,20 +364,32 @@ async def get_all_kitty(
         404: {
             "description": "Не найден котенок",
         },
+        412: {
+            "description": "Котенок изменен другим запросом",
+        },
     }
 )
 async def update_kitty(
         kitty_id: int,
         kitty_in: KittyIn.Update,
+        response: Response,
+        if_match: Optional[str] = Header(None),
+        token_payload: UserTokenPayload = Depends(get_token_payload),
         db_connect: AsyncSession = Depends(get_db),
 ):
     query = select(Kitty).filter(
-        and_(Kitty.id == kitty_id, Kitty.deleted_at == None)
+        and_(Kitty.id == kitty_id, Kitty.owner_id == token_payload.user_id, Kitty.deleted_at == None)
     )
     kitty: Kitty = (await db_connect.execute(query)).scalar()
 
     if not kitty:
         raise HTTPException(status_code=404, detail="Не найден котенок")
+    if not _if_match_allows(if_match, kitty.version):
+        raise HTTPException(
+            status_code=412,
+            detail="Котенок изменен другим запросом",
+            headers={"ETag": _kitty_etag(kitty.version)},
+        )
 
     update_data = kitty_in.dict(exclude_unset=True)
 
@@ -184,7 +399,15 @@ async def update_kitty(
 
     kitty.updated_at = datetime.now()
 
-    return KittyOut(
+    # UPDATE идет с условием на прочитанную версию: если строку успели
+    # изменить после SELECT, ORM не найдет ее и бросит StaleDataError
+    try:
+        await db_connect.flush()
+    except StaleDataError:
+        raise HTTPException(status_code=412, detail="Котенок изменен другим запросом")
+    response.headers["ETag"] = _kitty_etag(kitty.version)
+
+    kitty_out = KittyOut(
         created_at=kitty.created_at,
         updated_at=kitty.updated_at,
         deleted_at=kitty.deleted_at,
@@ -195,6 +418,8 @@ async def update_kitty(
         description=kitty.description,
         breed_id=kitty.breed_id,
     )
+    record_change(db_connect, "kitty", "update", kitty_out, token_payload.user_id)
+    return kitty_out
 
 
 @router.delete(
@@ -210,19 +435,86 @@ async def update_kitty(
             "description": "Не найден котенок.",
         },
         409: {
-            "description": "Котенок уже удален.",
+            "description": "Котенок уже удален или изменен другим запросом.",
         },
     }
 )
 async def soft_removal(
         kitty_id: int,
+        token_payload: UserTokenPayload = Depends(get_token_payload),
         db_connect: AsyncSession = Depends(get_db),
 ):
-    kitty_data: Kitty = (await db_connect.execute(select(Kitty).filter(Kitty.id == kitty_id))).scalar()
+    kitty_data: Kitty = (
+        await db_connect.execute(
+            select(Kitty).filter(and_(Kitty.id == kitty_id, Kitty.owner_id == token_payload.user_id))
+        )
+    ).scalar()
 
     if not kitty_data:
         raise HTTPException(status_code=404, detail="Не найден котенок.")
     if kitty_data.deleted_at:
         raise HTTPException(status_code=409, detail="Котенок уже удален.")
     kitty_data.deleted_at = datetime.now()
+    try:
+        await db_connect.flush()
+    except StaleDataError:
+        raise HTTPException(status_code=409, detail="Котенок изменен другим запросом.")
+    record_change(db_connect, "kitty", "delete", KittyOut(
+        created_at=kitty_data.created_at,
+        updated_at=kitty_data.updated_at,
+        deleted_at=kitty_data.deleted_at,
+        id=kitty_data.id,
+        name=kitty_data.name,
+        color=kitty_data.color,
+        age=kitty_data.age,
+        description=kitty_data.description,
+        breed_id=kitty_data.breed_id,
+    ), token_payload.user_id)
     return f"Котенок {kitty_data.id} - {kitty_data.name} удален"
+
+
+@router.patch(
+    "/kitty/bulk",
+    response_model=KittyBulkOut,
+    description="Массовое изменение котят текущего пользователя по списку id или по фильтру.",
+    summary="Массовое изменение котят.",
+    responses={
+        200: {"description": "Информация изменена."},
+        400: {
+            "description": "Нет полей для изменения",
+        },
+        500: {
+            "description": "Ошибка редактирования",
+        },
+    }
+)
+async def bulk_update_kitty(
+        bulk_in: KittyBulkIn.Update,
+        token_payload: UserTokenPayload = Depends(get_token_payload),
+        db_connect: AsyncSession = Depends(get_db),
+):
+    values = patch_values(bulk_in.patch)
+    if not values:
+        raise HTTPException(status_code=400, detail="Нет полей для изменения")
+
+    return await apply_bulk(db_connect, bulk_in, values, "update", token_payload.user_id)
+
+
+@router.delete(
+    "/kitty/bulk",
+    response_model=KittyBulkOut,
+    description="Массовое мягкое удаление котят текущего пользователя по списку id или по фильтру.",
+    summary="Массовое мягкое удаление котят.",
+    responses={
+        200: {"description": "Успешное удаление."},
+        500: {
+            "description": "Ошибка удаления",
+        },
+    }
+)
+async def bulk_soft_removal(
+        bulk_in: KittyBulkIn.Delete,
+        token_payload: UserTokenPayload = Depends(get_token_payload),
+        db_connect: AsyncSession = Depends(get_db),
+):
+    return await apply_bulk(db_connect, bulk_in, {"deleted_at": datetime.now()}, "delete", token_payload.user_id)
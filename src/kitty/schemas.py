@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 from src.breed.schemas import BreedOut
 
@@ -22,6 +22,31 @@ class KittyIn:
         breed_id: int | None
 
 
+class KittyFilter(BaseModel):
+    breed_id: int | None = None
+    color: str | None = None
+
+
+class KittyBulkIn:
+    class Delete(BaseModel):
+        ids: List[int] | None = Field(default=None, min_length=1, max_length=10_000)
+        filter: KittyFilter | None = None
+
+        @model_validator(mode="after")
+        def check_target(self):
+            if (self.ids is None) == (self.filter is None):
+                raise ValueError("Нужно передать либо ids, либо filter")
+            if self.filter is not None and not self.filter.dict(exclude_none=True):
+                raise ValueError("Фильтр не может быть пустым")
+            return self
+
+    class Update(Delete):
+        patch: KittyIn.Update
+
+    class Import(BaseModel):
+        kittens: List[KittyIn.Create] = Field(min_length=1, max_length=10_000)
+
+
 class KittyOut(BaseModel):
     created_at: datetime
     updated_at: datetime
@@ -41,3 +66,30 @@ class KittyOutWithBreed(BaseModel):
 
 class KittyOutList(BaseModel):
     kittens: List[KittyOut]
+
+
+class KittyOutBatch(BaseModel):
+    kittens: List[KittyOutWithBreed]
+    missing_ids: List[int]
+
+
+class KittyBulkOut(BaseModel):
+    updated: List[int]
+    not_found: List[int]
+    already_deleted: List[int]
+
+
+class KittyImportOut(BaseModel):
+    created: List[int]
+
+
+class KittySearchHit(BaseModel):
+    kitty: KittyOut
+    rank: float
+    name_highlight: str
+    description_highlight: str | None
+
+
+class KittySearchOut(BaseModel):
+    hits: List[KittySearchHit]
+    next_cursor: str | None
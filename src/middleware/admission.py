@@ -0,0 +1,132 @@
+"""
+    Ограничение числа одновременных запросов к БД в воркере (admission control).
+
+    Запросов в работе не больше max_in_flight (по умолчанию - размер пула БД
+    вместе с overflow), остальные ждут в очереди с приоритетами: дешевые
+    маршруты (котенок по id) проходят раньше дорогих (список всех котят).
+    Если очередь длиннее max_queue или ожидание дольше max_wait, запрос сразу
+    получает 503 с Retry-After, а не висит до pool_timeout.
+"""
+import asyncio
+import heapq
+import itertools
+from typing import Dict, List
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.middleware.responses import reject
+from src.middleware.routing import route_key
+
+DEFAULT_PRIORITY = 1
+
+
+class AdmissionController:
+    """
+        Семафор с очередью по приоритетам (меньше - важнее) и отказом при переполнении.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, max_wait: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.admitted_total = 0
+        self.shed_total = 0
+        self._waiters: List[list] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    def _shed(self, waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(False)
+
+    async def acquire(self, priority: int) -> bool:
+        """
+            True - запрос допущен и обязан вызвать release(), False - отказ.
+        """
+        if self.in_flight < self.max_in_flight and not self.queue_depth:
+            self.in_flight += 1
+            self.admitted_total += 1
+            return True
+
+        if self.queue_depth >= self.max_queue:
+            # Очередь полна: вытесняем самый неважный запрос, если новый важнее него.
+            # При max_queue=0 вытеснять некого - отказ получает сам новый запрос
+            pending = [entry for entry in self._waiters if not entry[2].done()]
+            worst = max(pending, key=lambda entry: (entry[0], entry[1]), default=None)
+            if worst is None or worst[0] <= priority:
+                self.shed_total += 1
+                return False
+            self._shed(worst[2])
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        heapq.heappush(self._waiters, [priority, next(self._sequence), waiter])
+        timeout = loop.call_later(self.max_wait, self._shed, waiter)
+        try:
+            admitted = await waiter
+        except asyncio.CancelledError:
+            # Клиент ушел, пока ждал: если слот уже был передан, отдаем его дальше
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()
+            raise
+        finally:
+            timeout.cancel()
+
+        if admitted:
+            self.admitted_total += 1
+        else:
+            self.shed_total += 1
+        return admitted
+
+    def release(self):
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                # Слот переходит следующему в очереди, in_flight не меняется
+                waiter.set_result(True)
+                return
+        self.in_flight -= 1
+
+    def gauges(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_in_flight": self.max_in_flight,
+            "admitted_total": self.admitted_total,
+            "shed_total": self.shed_total,
+        }
+
+
+class AdmissionControlMiddleware:
+    def __init__(
+            self,
+            app: ASGIApp,
+            controller: AdmissionController,
+            priorities: Dict[str, int],
+            exempt: List[str],
+            retry_after: float = 1,
+    ):
+        self.app = app
+        self.controller = controller
+        self.priorities = priorities
+        self.exempt = set(exempt)
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        key = route_key(scope)
+        if key is None or key in self.exempt:
+            return await self.app(scope, receive, send)
+
+        if not await self.controller.acquire(self.priorities.get(key, DEFAULT_PRIORITY)):
+            return await reject(send, 503, "Сервис перегружен, повторите позже", self.retry_after)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
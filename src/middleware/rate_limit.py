@@ -0,0 +1,199 @@
+"""
+    Ограничение частоты запросов (token bucket) по IP клиента и по user_id.
+
+    Лимиты задаются на шаблон маршрута в settings.rate_limits, например
+    {"GET /kitty/all/": {"ip": "60/60", "user": "30/60"}} - 60 запросов за 60 секунд
+    с одного IP и 30 за 60 секунд на пользователя. Отказ (429 и Retry-After)
+    отдается в middleware, то есть до зависимостей маршрута и сессии БД.
+
+    Все корзины запроса проверяются вместе: токены забираются, только если
+    их хватает во всех, иначе отказ не уменьшает ни одну.
+
+    Хранилище корзин подключаемое: в памяти процесса или общее в Redis.
+"""
+import time
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.settings import AppSettings
+from src.middleware.responses import reject
+from src.middleware.routing import route_key
+from src.user.auth import decode_token_once, TokenError
+
+
+Bucket = Tuple[str, int, float]
+
+
+class BucketStore(Protocol):
+    async def take_all(self, buckets: List[Bucket]) -> float:
+        """
+            Забирает по токену из каждой корзины (ключ, емкость, пополнение в секунду),
+            только если токен есть во всех. Возвращает 0, если можно, иначе сколько
+            секунд ждать; при отказе ни одна корзина не уменьшается.
+        """
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Забирает токен из одной корзины, ответ как у take_all."""
+
+
+class MemoryBucketStore:
+    """
+        Корзины в памяти процесса: лимит действует на каждый воркер отдельно.
+    """
+
+    SWEEP_EVERY = 10_000
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float, int, float]] = {}
+        self._takes = 0
+
+    async def take_all(self, buckets: List[Bucket]) -> float:
+        now = time.monotonic()
+        refilled = {}
+        retry_after = 0.0
+        for key, capacity, refill_per_second in buckets:
+            tokens, updated_at, _, _ = self._buckets.get(key, (capacity, now, capacity, refill_per_second))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+            if tokens < 1:
+                retry_after = max(retry_after, (1 - tokens) / refill_per_second)
+            refilled[key] = (tokens, capacity, refill_per_second)
+
+        for key, (tokens, capacity, refill_per_second) in refilled.items():
+            if retry_after == 0:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, capacity, refill_per_second)
+
+        self._takes += 1
+        if self._takes % self.SWEEP_EVERY == 0:
+            self._sweep(now)
+        return retry_after
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        return await self.take_all([(key, capacity, refill_per_second)])
+
+    def _sweep(self, now: float):
+        # Полные корзины ничем не отличаются от отсутствующих
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if bucket[0] + (now - bucket[1]) * bucket[3] < bucket[2]
+        }
+
+
+# KEYS - корзины, ARGV - пары (емкость, пополнение в секунду) в том же порядке
+TOKEN_BUCKET_LUA = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tokens = {}
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local ts = tonumber(bucket[2]) or now
+    tokens[i] = math.min(capacity, (tonumber(bucket[1]) or capacity) + (now - ts) * rate)
+    if tokens[i] < 1 then
+        retry_after = math.max(retry_after, (1 - tokens[i]) / rate)
+    end
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    if retry_after == 0 then
+        tokens[i] = tokens[i] - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens[i]), 'ts', tostring(now))
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+end
+return tostring(retry_after)
+"""
+
+
+class RedisBucketStore:
+    """
+        Корзины в Redis (или любом сервере с протоколом Redis): лимит общий
+        для всех воркеров. Корзина обновляется атомарно Lua-скриптом.
+    """
+
+    def __init__(self, client, prefix: str = "rate_limit:"):
+        self._client = client
+        self._prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_LUA)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBucketStore":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("Для rate_limit_backend=redis нужен пакет redis") from e
+        return cls(Redis.from_url(url))
+
+    async def take_all(self, buckets: List[Bucket]) -> float:
+        return float(await self._script(
+            keys=[self._prefix + key for key, _, _ in buckets],
+            args=[value for _, capacity, refill_per_second in buckets for value in (capacity, refill_per_second)],
+        ))
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        return await self.take_all([(key, capacity, refill_per_second)])
+
+
+def get_bucket_store(settings: AppSettings) -> BucketStore:
+    if settings.rate_limit_backend == "redis":
+        if not settings.rate_limit_redis_url:
+            raise RuntimeError("Для rate_limit_backend=redis нужен rate_limit_redis_url")
+        return RedisBucketStore.from_url(settings.rate_limit_redis_url)
+    return MemoryBucketStore()
+
+
+def parse_limit(limit: str) -> Tuple[int, float]:
+    """ "30/60" -> (емкость 30, пополнение 0.5 токена в секунду)"""
+    requests, seconds = limit.split("/")
+    return int(requests), int(requests) / float(seconds)
+
+
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp, store: BucketStore, settings: AppSettings):
+        self.app = app
+        self.store = store
+        self.settings = settings
+        self.rules: Dict[str, List[Tuple[str, int, float]]] = {
+            key: [(kind, *parse_limit(limit)) for kind, limit in limits.items()]
+            for key, limits in settings.rate_limits.items()
+        }
+
+    def _user_id(self, scope: Scope) -> Optional[int]:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer":
+                    return None
+                try:
+                    return decode_token_once(scope, token, self.settings).get("user_id")
+                except TokenError:
+                    # Невалидный токен отклонит зависимость маршрута
+                    return None
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        key = route_key(scope)
+        rules = self.rules.get(key) if key else None
+        if rules:
+            buckets = []
+            for kind, capacity, refill_per_second in rules:
+                if kind == "ip":
+                    subject = scope["client"][0] if scope.get("client") else "unknown"
+                else:
+                    subject = self._user_id(scope)
+                    if subject is None:
+                        continue
+                buckets.append((f"{key}:{kind}:{subject}", capacity, refill_per_second))
+            # Отказ по одному правилу не тратит токены остальных
+            retry_after = await self.store.take_all(buckets) if buckets else 0.0
+            if retry_after > 0:
+                return await reject(send, 429, "Слишком много запросов", retry_after)
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,22 @@
+import json
+import math
+
+from starlette.types import Send
+
+
+async def reject(send: Send, status_code: int, detail: str, retry_after: float):
+    """
+        Отказ прямо из middleware, до маршрута: JSON как у HTTPException
+        и заголовок Retry-After в целых секундах.
+    """
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
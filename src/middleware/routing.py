@@ -0,0 +1,22 @@
+from typing import Optional
+
+from starlette.routing import Match
+from starlette.types import Scope
+
+ROUTE_KEY = "route_key"
+
+
+def route_key(scope: Scope) -> Optional[str]:
+    """
+        "МЕТОД /шаблон пути" маршрута, который обработает запрос, например
+        "GET /kitty/{kitty_id}". Маршрут ищется в том же порядке, что и в роутере;
+        результат запоминается в scope, чтобы middleware не искали его повторно.
+    """
+    if ROUTE_KEY not in scope:
+        scope[ROUTE_KEY] = None
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                scope[ROUTE_KEY] = f"{scope['method']} {route.path}"
+                break
+    return scope[ROUTE_KEY]
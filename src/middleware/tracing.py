@@ -0,0 +1,37 @@
+"""
+    Корневой спан на каждый HTTP-запрос.
+
+    Подключается только при tracing_enabled и должен быть внешним middleware,
+    чтобы в спан запроса попали лимиты и ожидание в очереди допуска. Сама
+    трассировка включается в lifespan: до setup_tracing и после
+    shutdown_tracing запросы проходят без спанов.
+"""
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core import tracing
+from src.middleware.routing import route_key
+
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not tracing.is_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        key = route_key(scope)
+        # Имя спана - шаблон пути, а не сам путь: иначе имен столько же, сколько id
+        attributes = {"http.request.method": scope["method"], "url.path": scope["path"]}
+        if key is not None:
+            attributes["http.route"] = key.split(" ", 1)[1]
+        with tracing.request_span(key or scope["method"], Headers(scope=scope), attributes) as request_span:
+            async def send_with_status(message: Message):
+                if message["type"] == "http.response.start":
+                    tracing.set_response_status(request_span, message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+
@@ -0,0 +1,68 @@
+import logging
+from typing import AsyncGenerator, List
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+from core import tracing
+
+logger = logging.getLogger(__name__)
+
+
+def _dump_items(items: List[BaseModel], adapter: TypeAdapter) -> bytes:
+    with tracing.span("response.serialize", {"items": len(items)}):
+        return adapter.dump_json(items)[1:-1]
+
+
+async def json_list_stream(
+        field: str,
+        first_chunk: bytes,
+        partitions: AsyncGenerator[List[BaseModel], None],
+        adapter: TypeAdapter,
+) -> AsyncGenerator[bytes, None]:
+    """
+        Отдает {"<field>": [...]} кусками: каждая пачка элементов сериализуется
+        и уходит клиенту, не дожидаясь остальных. По формату совпадает с
+        обычной моделью-списком.
+
+        Ошибка посреди отдачи пишется в лог и пробрасывается дальше: тело
+        остается без закрывающего "]}", а сервер обрывает соединение без
+        последнего chunk, так что клиент видит оборванный ответ, а не
+        короткий, но валидный список.
+    """
+    try:
+        yield b'{"' + field.encode() + b'":[' + first_chunk
+        empty = not first_chunk
+        async for items in partitions:
+            if not items:
+                continue
+            chunk = _dump_items(items, adapter)
+            yield chunk if empty else b"," + chunk
+            empty = False
+        yield b"]}"
+    except Exception:
+        logger.exception("Ответ со списком %s оборван: ошибка после отправки заголовков", field)
+        raise
+    finally:
+        await partitions.aclose()
+
+
+async def json_list_response(
+        field: str,
+        partitions: AsyncGenerator[List[BaseModel], None],
+        adapter: TypeAdapter,
+) -> StreamingResponse:
+    """
+        Первая пачка читается и сериализуется до отправки заголовков, поэтому
+        ошибка запроса к БД дает обычный ответ 500, а не оборванный 200.
+    """
+    try:
+        first_items = await anext(partitions, [])
+        first_chunk = _dump_items(first_items, adapter) if first_items else b""
+    except BaseException:
+        await partitions.aclose()
+        raise
+    return StreamingResponse(
+        json_list_stream(field, first_chunk, partitions, adapter),
+        media_type="application/json",
+    )
@@ -1,14 +1,80 @@
 from datetime import timedelta, datetime
-from typing import Optional
+from typing import Optional, Tuple
 
-from jose import jwt
 from fastapi import Depends
+from sqlalchemy import update, and_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.session import get_settings
 from core.settings import AppSettings
+from database.models import RefreshToken, User, NOW_AT_UTC
 from src.user.schemas import UserTokenPayload
 
 
+DECODED_TOKEN_KEY = "decoded_token"
+
+
+class TokenError(Exception):
+    """Токен не прошел проверку подписи или формата."""
+
+
+class TokenExpiredError(TokenError):
+    """Срок жизни токена истек."""
+
+
+def encode_token(payload: dict, settings: AppSettings) -> str:
+    if settings.is_jwt_asymmetric():
+        from src.user.keys import get_key_set
+
+        return get_key_set().encode(payload)
+
+    from jose import jwt
+
+    return jwt.encode(payload, settings.jwt_key, algorithm=settings.jwt_algorithm)
+
+
+def decode_token(token: str, settings: AppSettings) -> dict:
+    # Библиотеки токенов импортируются при первой проверке токена,
+    # а не при старте приложения
+    if settings.is_jwt_asymmetric():
+        import jwt
+        from src.user.keys import get_key_set
+
+        try:
+            return get_key_set().decode(token)
+        except jwt.ExpiredSignatureError as e:
+            raise TokenExpiredError() from e
+        except jwt.PyJWTError as e:
+            raise TokenError() from e
+
+    from jose import jwt, JWTError, ExpiredSignatureError
+
+    try:
+        return jwt.decode(token, settings.jwt_key, algorithms=settings.jwt_algorithm)
+    except ExpiredSignatureError as e:
+        raise TokenExpiredError() from e
+    except JWTError as e:
+        raise TokenError() from e
+
+
+def decode_token_once(scope: dict, token: str, settings: AppSettings) -> dict:
+    """
+        decode_token с запоминанием результата (или ошибки) в scope запроса:
+        middleware ограничения частоты и зависимость маршрута проверяют
+        подпись одного и того же токена один раз.
+    """
+    cached = scope.get(DECODED_TOKEN_KEY)
+    if cached is None or cached[0] != token:
+        try:
+            cached = (token, decode_token(token, settings), None)
+        except TokenError as e:
+            cached = (token, None, e)
+        scope[DECODED_TOKEN_KEY] = cached
+    if cached[2] is not None:
+        raise cached[2]
+    return cached[1]
+
+
 def create_access_token(
         user_id: int,
         expires_delta: Optional[timedelta] = None,
@@ -16,15 +82,49 @@ def create_access_token(
 ):
     expire = datetime.utcnow() + (expires_delta or timedelta(days=settings.access_token_expire))
     payload = ({"exp": expire, **UserTokenPayload(user_id=user_id).dict()})
-    return jwt.encode(payload, settings.jwt_key, algorithm=settings.jwt_algorithm)
+    return encode_token(payload, settings)
 
 
-def create_refresh_token(
+def issue_refresh_token(
+        db_connect: AsyncSession,
         user_id: int,
+        settings: AppSettings,
         expires_delta: Optional[timedelta] = None,
-        settings: AppSettings = Depends(get_settings)
-):
+) -> str:
+    """
+        Выпускает refresh токен и сохраняет его jti в refresh_tokens.
+        Запись уходит в БД вместе с коммитом текущей сессии.
+    """
     expire = datetime.utcnow() + (expires_delta or timedelta(days=settings.refresh_token_expire))
-    payload = ({"exp": expire, **UserTokenPayload(user_id=user_id).dict()})
-    return jwt.encode(payload, settings.jwt_key, algorithm=settings.jwt_algorithm)
+    token_payload = UserTokenPayload(user_id=user_id)
+    db_connect.add(RefreshToken(jti=token_payload.jti, user_id=user_id, expires_at=expire))
+    payload = ({"exp": expire, **token_payload.dict()})
+    return encode_token(payload, settings)
+
+
+async def revoke_refresh_token(db_connect: AsyncSession, jti: str) -> Optional[Tuple[int, str]]:
+    """
+        Отзывает действующий refresh токен одним UPDATE по первичному ключу jti.
 
+        Возвращает (user_id, username) или None, если токен не найден, уже отозван,
+        истек или пользователь удален.
+    """
+    tokens = RefreshToken.__table__
+    users = User.__table__
+    row = (
+        await db_connect.execute(
+            update(tokens)
+            .where(
+                and_(
+                    tokens.c.jti == jti,
+                    tokens.c.revoked_at == None,
+                    tokens.c.expires_at > NOW_AT_UTC,
+                    users.c.id == tokens.c.user_id,
+                    users.c.deleted_at == None,
+                )
+            )
+            .values(revoked_at=NOW_AT_UTC)
+            .returning(tokens.c.user_id, users.c.username)
+        )
+    ).first()
+    return tuple(row) if row else None
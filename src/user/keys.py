@@ -0,0 +1,112 @@
+"""
+    Асимметричные ключи для подписи токенов (EdDSA / ES256).
+
+    Сервис подписывает токены приватным ключом с активным kid, а проверяет
+    по набору публичных ключей в формате JWKS. Набор загружается один раз
+    при старте и отдается наружу на /.well-known/jwks.json, так что другие
+    сервисы могут проверять токены локально, без запросов к нам.
+
+    Ротация: сгенерировать новый ключ (старые публичные ключи остаются в JWKS),
+    переключить jwt_kid на новый kid, а после истечения старых токенов удалить
+    старый ключ из JWKS.
+
+        python -m src.user.keys --kid 2026-10 --algorithm EdDSA \\
+            --private-key keys/2026-10.pem --jwks keys/jwks.json
+"""
+import argparse
+import json
+import os
+from functools import lru_cache
+from typing import Dict
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from core.session import get_settings
+from core.settings import ASYMMETRIC_JWT_ALGORITHMS
+
+
+def generate_private_key(algorithm: str):
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    raise ValueError(f"Неподдерживаемый алгоритм {algorithm}")
+
+
+def public_jwk(private_key, kid: str, algorithm: str) -> dict:
+    jwk = jwt.get_algorithm_by_name(algorithm).to_jwk(private_key.public_key(), as_dict=True)
+    return {**jwk, "kid": kid, "alg": algorithm, "use": "sig"}
+
+
+class KeySet:
+    """
+        Ключ подписи с активным kid и публичные ключи проверки по kid.
+    """
+
+    def __init__(self, algorithm: str, signing_kid: str, signing_key, jwks: dict):
+        self.algorithm = algorithm
+        self.signing_kid = signing_kid
+        self.signing_key = signing_key
+        self.jwks = jwks
+        self.verifying_keys: Dict[str, object] = {
+            key.key_id: key.key for key in jwt.PyJWKSet.from_dict(jwks).keys
+        }
+        if signing_kid not in self.verifying_keys:
+            raise ValueError(f"Публичного ключа для kid={signing_kid} нет в JWKS")
+
+    def encode(self, payload: dict) -> str:
+        return jwt.encode(payload, self.signing_key, algorithm=self.algorithm, headers={"kid": self.signing_kid})
+
+    def decode(self, token: str) -> dict:
+        """
+            Проверяет подпись ключом из заголовка kid. Ошибки - исключения PyJWT
+            (jwt.ExpiredSignatureError, jwt.InvalidTokenError).
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.verifying_keys.get(kid)
+        if key is None:
+            raise jwt.InvalidKeyError(f"Неизвестный kid {kid}")
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+
+@lru_cache()
+def get_key_set() -> KeySet:
+    settings = get_settings()
+    if not (settings.jwt_private_key_path and settings.jwt_jwks_path and settings.jwt_kid):
+        raise RuntimeError("Для асимметричной подписи нужны jwt_private_key_path, jwt_jwks_path и jwt_kid")
+
+    with open(settings.jwt_private_key_path, "rb") as file:
+        private_key = serialization.load_pem_private_key(file.read(), password=None)
+    with open(settings.jwt_jwks_path, encoding="utf-8") as file:
+        jwks = json.load(file)
+    return KeySet(settings.jwt_algorithm, settings.jwt_kid, private_key, jwks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Генерация ключа подписи и добавление его в JWKS.")
+    parser.add_argument("--kid", required=True)
+    parser.add_argument("--algorithm", choices=ASYMMETRIC_JWT_ALGORITHMS, default="EdDSA")
+    parser.add_argument("--private-key", required=True, help="Куда сохранить приватный ключ (PEM)")
+    parser.add_argument("--jwks", required=True, help="JWKS с публичными ключами, дополняется")
+    args = parser.parse_args()
+
+    new_key = generate_private_key(args.algorithm)
+    with open(args.private_key, "wb") as key_file:
+        key_file.write(new_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    os.chmod(args.private_key, 0o600)
+
+    key_set = {"keys": []}
+    if os.path.exists(args.jwks):
+        with open(args.jwks, encoding="utf-8") as jwks_file:
+            key_set = json.load(jwks_file)
+    key_set["keys"] = [key for key in key_set["keys"] if key.get("kid") != args.kid]
+    key_set["keys"].append(public_jwk(new_key, args.kid, args.algorithm))
+    with open(args.jwks, "w", encoding="utf-8") as jwks_file:
+        json.dump(key_set, jwks_file, indent=2)
+    print(f"Ключ {args.kid} добавлен в {args.jwks}, активируйте его через JWT_KID={args.kid}")
@@ -1,7 +1,6 @@
 import hashlib
 
 from fastapi import APIRouter, Depends, HTTPException
-from jose import jwt, JWTError
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -9,7 +8,9 @@ from core.session import get_db, get_settings
 from core.settings import AppSettings
 from database.models import User
 from src.dependencies.authentication import get_token_payload, get_current_user
-from src.user.auth import create_refresh_token, create_access_token
+from src.user.auth import (
+    create_access_token, decode_token, issue_refresh_token, revoke_refresh_token, TokenError
+)
 from src.user.schemas import UserOut, UserIn, TokenResponse
 
 router = APIRouter()
@@ -30,7 +31,6 @@ router = APIRouter()
 async def register(
         user: UserIn.Create,
         db_connect: AsyncSession = Depends(get_db),
-        settings: AppSettings = Depends(get_settings)
 ) -> UserOut.Create:
     user_data = user.dict()
     user_add = User(
@@ -39,8 +39,6 @@ async def register(
     )
     db_connect.add(user_add)
     await db_connect.flush()
-    await db_connect.refresh(user_add)
-    user_add.refresh_token = create_refresh_token(user_add.id, settings=settings)
     return UserOut.Create(
         created_at=user_add.created_at,
         updated_at=user_add.updated_at,
@@ -93,7 +91,7 @@ async def login(
             user_id=user.id,
             username=user.username,
             access_token=access_token,
-            refresh_token=user.refresh_token,
+            refresh_token=issue_refresh_token(db_connect, user.id, settings),
             token_type='bearer'
         )
 
@@ -112,7 +110,6 @@ async def me(
         id=current_user.id,
         password=current_user.password_hash,
         username=current_user.username,
-        refresh_token=current_user.refresh_token,
     )
 
 
@@ -137,17 +134,39 @@ async def refresh(
         settings: AppSettings = Depends(get_settings)
 ) -> TokenResponse:
     try:
-        payload = jwt.decode(refresh_token, settings.jwt_key, algorithms=settings.jwt_algorithm)
-        user = (await db_connect.execute(select(User).filter(User.id == payload.get("user_id")))).scalar()
-        if not user:
-            raise HTTPException(status_code=401, detail="Невалидный refresh token")
-        new_access_token = create_access_token(user.id, settings=settings)
-        return TokenResponse(
-            user_id=user.id,
-            username=user.username,
-            access_token=new_access_token,
-            refresh_token=user.refresh_token,
-            token_type='bearer'
-        )
-    except JWTError:
+        payload = decode_token(refresh_token, settings)
+    except TokenError:
         raise HTTPException(status_code=401, detail="Невалидный refresh token")
+
+    owner = await revoke_refresh_token(db_connect, payload.get("jti"))
+    if not owner:
+        raise HTTPException(status_code=401, detail="Невалидный refresh token")
+    user_id, username = owner
+    return TokenResponse(
+        user_id=user_id,
+        username=username,
+        access_token=create_access_token(user_id, settings=settings),
+        refresh_token=issue_refresh_token(db_connect, user_id, settings),
+        token_type='bearer'
+    )
+
+
+@router.get(
+    "/.well-known/jwks.json",
+    description="Публичные ключи для локальной проверки токенов другими сервисами.",
+    summary="Публичные ключи проверки токенов.",
+    responses={
+        200: {"description": "Успешный запрос."},
+        404: {
+            "description": "Токены подписываются симметричным ключом",
+        },
+    }
+)
+async def jwks(
+        settings: AppSettings = Depends(get_settings)
+):
+    if not settings.is_jwt_asymmetric():
+        raise HTTPException(status_code=404, detail="Токены подписываются симметричным ключом")
+    from src.user.keys import get_key_set
+
+    return get_key_set().jwks
@@ -33,7 +33,6 @@ class UserOut:
     class Me(Base):
         username: str
         password: str
-        refresh_token: str
 
 
 class TokenResponse(BaseModel):
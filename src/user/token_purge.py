@@ -0,0 +1,71 @@
+"""
+    Удаление истекших refresh токенов пачками.
+
+    Запуск разово из командной строки:
+        python -m src.user.token_purge
+
+    или периодически в фоне приложения (token_purge_enabled=True).
+"""
+import asyncio
+import logging
+
+from sqlalchemy import select, delete
+
+from core.session import async_session, get_settings, get_engine
+from database.models import RefreshToken, NOW_AT_UTC
+
+logger = logging.getLogger(__name__)
+
+
+def purge_batch_statement(batch_size: int):
+    expired_jti = (
+        select(RefreshToken.jti)
+        .where(RefreshToken.expires_at < NOW_AT_UTC)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        delete(RefreshToken)
+        .where(RefreshToken.jti.in_(expired_jti.scalar_subquery()))
+        .returning(RefreshToken.jti)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def purge_expired_tokens() -> int:
+    batch_size = get_settings().token_purge_batch_size
+    purged_total = 0
+    while True:
+        async with async_session() as session:
+            purged = len((await session.execute(purge_batch_statement(batch_size))).all())
+            await session.commit()
+        purged_total += purged
+        if purged < batch_size:
+            logger.info("Удалено истекших refresh токенов: %s", purged_total)
+            return purged_total
+
+
+async def purge_expired_tokens_forever():
+    """
+        Фоновая задача приложения: очистка раз в token_purge_interval секунд.
+    """
+    while True:
+        try:
+            await purge_expired_tokens()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Ошибка очистки refresh токенов")
+        await asyncio.sleep(get_settings().token_purge_interval)
+
+
+async def _run_cli():
+    try:
+        print(await purge_expired_tokens())
+    finally:
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_cli())
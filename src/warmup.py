@@ -0,0 +1,54 @@
+import asyncio
+
+from sqlalchemy import select, and_
+from sqlalchemy.orm import selectinload
+
+from core.session import async_session, get_settings
+from database.models import Kitty, Breed, User
+from src.breed.cache import breed_catalog
+
+
+def hot_statements() -> tuple:
+    """
+        Самые частые запросы роутеров.
+
+        Построены так же, как в роутерах, чтобы SQL совпадал и asyncpg
+        переиспользовал подготовленные при прогреве statements.
+    """
+    return (
+        select(Kitty)
+        .filter(
+            and_(Kitty.id == 0, Kitty.deleted_at == None)
+        )
+        .options(
+            selectinload(Kitty.breed)
+        ),
+        select(Breed)
+        .order_by(Breed.id),
+        select(User).filter(User.id == 0),
+    )
+
+
+async def _warm_up_connection():
+    async with async_session() as session:
+        for statement in hot_statements():
+            await session.execute(statement)
+
+
+async def warm_up():
+    """
+        Прогрев приложения перед приемом трафика.
+
+        Открывает pool_size соединений (вместе с интроспекцией типов asyncpg),
+        подготавливает на каждом горячие запросы, загружает справочник пород
+        и ключи подписи токенов.
+    """
+    if get_settings().is_jwt_asymmetric():
+        from src.user.keys import get_key_set
+
+        get_key_set()
+    await asyncio.gather(
+        *(_warm_up_connection() for _ in range(get_settings().db_pool_size))
+    )
+    async with async_session() as session:
+        await breed_catalog.load(session)
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from src.middleware.admission import AdmissionController
+
+pytestmark = pytest.mark.anyio
+
+
+async def settle():
+    """Дает ожидающим задачам дойти до очереди или забрать переданный слот."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def busy_controller(**kwargs) -> AdmissionController:
+    """Контроллер с одним слотом, который уже занят."""
+    options = {"max_in_flight": 1, "max_queue": 10, "max_wait": 5.0} | kwargs
+    controller = AdmissionController(**options)
+    assert await controller.acquire(1)
+    return controller
+
+
+async def test_admits_up_to_max_in_flight():
+    controller = AdmissionController(max_in_flight=2, max_queue=0, max_wait=5.0)
+    assert await controller.acquire(1)
+    assert await controller.acquire(1)
+    assert not await controller.acquire(0)
+    assert controller.gauges()["in_flight"] == 2
+
+
+async def test_full_queue_without_waiters_sheds_new_request():
+    controller = await busy_controller(max_queue=0)
+
+    assert not await controller.acquire(0)
+    assert controller.shed_total == 1
+
+
+async def test_waiters_admitted_by_priority_then_arrival():
+    controller = await busy_controller()
+    admitted = []
+
+    async def request(name: str, priority: int):
+        if await controller.acquire(priority):
+            admitted.append(name)
+
+    tasks = []
+    for name, priority in [("list", 2), ("get-1", 0), ("batch", 1), ("get-2", 0)]:
+        tasks.append(asyncio.create_task(request(name, priority)))
+        await settle()
+    assert controller.queue_depth == 4
+
+    for _ in tasks:
+        controller.release()
+        await settle()
+    await asyncio.gather(*tasks)
+
+    assert admitted == ["get-1", "get-2", "batch", "list"]
+    assert controller.in_flight == 1
+
+
+async def test_full_queue_evicts_less_important_waiter():
+    controller = await busy_controller(max_queue=1)
+    expensive = asyncio.create_task(controller.acquire(2))
+    await settle()
+
+    cheap = asyncio.create_task(controller.acquire(0))
+    await settle()
+    assert await expensive is False
+    assert controller.queue_depth == 1
+
+    # Новый запрос не важнее ожидающего: отказ получает он сам
+    assert not await controller.acquire(0)
+
+    controller.release()
+    assert await cheap is True
+    assert controller.shed_total == 2
+
+
+async def test_wait_longer_than_max_wait_is_shed():
+    controller = await busy_controller(max_wait=0.05)
+
+    assert not await controller.acquire(0)
+    assert controller.shed_total == 1
+    assert controller.queue_depth == 0
+    assert controller.in_flight == 1
+
+
+async def test_cancelled_waiter_does_not_take_slot():
+    controller = await busy_controller()
+    waiter = asyncio.create_task(controller.acquire(0))
+    await settle()
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    controller.release()
+
+    assert controller.in_flight == 0
+    assert controller.queue_depth == 0
+
+
+async def test_slot_handed_to_cancelled_waiter_is_released():
+    controller = await busy_controller()
+    waiter = asyncio.create_task(controller.acquire(0))
+    await settle()
+
+    # Слот уже передан ожидающему, но клиент ушел раньше, чем задача проснулась
+    controller.release()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert controller.in_flight == 0
+    assert await controller.acquire(1)
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+
+from src.archive.job import ARCHIVED_TABLES, archive_batch_statement
+
+
+@pytest.mark.parametrize("table, archive_table", ARCHIVED_TABLES, ids=[table.name for table, _ in ARCHIVED_TABLES])
+def test_archive_keeps_every_column(table, archive_table):
+    statement = archive_batch_statement(table, archive_table, datetime.now(), 10)
+    copied = {column.name for column in statement.select.selected_columns}
+    assert copied == {column.name for column in table.c if column.computed is None}
+
+
+def test_archive_fails_on_missing_column():
+    metadata = sa.MetaData()
+    table = sa.Table(
+        "things", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("deleted_at", sa.DateTime),
+        sa.Column("version", sa.Integer),
+    )
+    archive_table = sa.Table(
+        "things_archive", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("deleted_at", sa.DateTime),
+    )
+    with pytest.raises(RuntimeError, match="version"):
+        archive_batch_statement(table, archive_table, datetime.now(), 10)
@@ -0,0 +1,50 @@
+import pytest
+
+from src.kitty.router import KITTY_BATCH_LIMIT
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def owner(users):
+    return await users.create()
+
+
+async def create_kitty(api_client, headers: dict, breed_id: int, name: str) -> int:
+    response = await api_client.post(
+        "/kitty/create/",
+        json={"name": name, "color": "black", "age": 3, "description": None, "breed_id": breed_id},
+        headers=headers,
+    )
+    return response.json()["id"]
+
+
+async def test_batch_keeps_request_order_and_reports_missing(api_client, users, owner, breed_id):
+    headers = users.headers(owner)
+    first, second, deleted = [await create_kitty(api_client, headers, breed_id, name) for name in ("a", "b", "c")]
+    await api_client.delete(f"/kitty/soft_removal/{deleted}", headers=headers)
+    missing = 2 ** 31 - 1
+
+    response = await api_client.get(
+        "/kitty/batch", params={"ids": [second, deleted, first, second, missing]}, headers=headers
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    # Повторный id отдается один раз, на месте первого вхождения
+    assert [item["kitty"]["id"] for item in body["kittens"]] == [second, first]
+    assert [item["kitty"]["name"] for item in body["kittens"]] == ["b", "a"]
+    assert {item["breed"]["id"] for item in body["kittens"]} == {breed_id}
+    assert body["missing_ids"] == [deleted, missing]
+
+
+async def test_batch_limits_number_of_ids(api_client, users, owner):
+    headers = users.headers(owner)
+    ids = list(range(1, KITTY_BATCH_LIMIT + 2))
+
+    response = await api_client.get("/kitty/batch", params={"ids": ids[:-1]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["missing_ids"] == ids[:-1]
+
+    assert (await api_client.get("/kitty/batch", params={"ids": ids}, headers=headers)).status_code == 422
+    assert (await api_client.get("/kitty/batch", headers=headers)).status_code == 422
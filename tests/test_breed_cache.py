@@ -0,0 +1,45 @@
+import pytest
+
+from core.session import async_session
+from src.breed.cache import BreedCatalog
+
+pytestmark = pytest.mark.anyio
+
+
+class InvalidatingSession:
+    """Сессия, во время чтения которой порода добавляется в другом запросе."""
+
+    def __init__(self, session, catalog):
+        self.session = session
+        self.catalog = catalog
+
+    async def execute(self, statement):
+        result = await self.session.execute(statement)
+        self.catalog.invalidate()
+        return result
+
+
+async def test_invalidated_after_commit_only(database):
+    catalog = BreedCatalog()
+    async with async_session() as session:
+        await catalog.load(session)
+
+        catalog.invalidate_on_commit(session)
+        assert catalog.is_fresh()
+        await session.rollback()
+        assert catalog.is_fresh()
+
+        catalog.invalidate_on_commit(session)
+        await session.commit()
+        assert not catalog.is_fresh()
+
+
+async def test_load_overlapping_invalidation_is_not_cached(database):
+    catalog = BreedCatalog()
+    async with async_session() as session:
+        breeds = await catalog.load(InvalidatingSession(session, catalog))
+        assert not catalog.is_fresh()
+
+        assert await catalog.all_json(session)
+        assert catalog.is_fresh()
+    assert breeds == await catalog.all(None)
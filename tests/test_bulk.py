@@ -0,0 +1,85 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from core.session import async_session, get_settings
+from database.models import Kitty
+
+pytestmark = pytest.mark.anyio
+
+
+def age_patch(age: int) -> dict:
+    """Поля KittyIn.Update обязательны; None - не менять."""
+    return {"name": None, "color": None, "age": age, "description": None, "breed_id": None}
+
+
+@pytest.fixture
+def create_kitty(api_client, users, breed_id):
+    async def create(owner_id: int, color: str = "black") -> int:
+        response = await api_client.post(
+            "/kitty/create/",
+            json={"name": "bulk", "color": color, "age": 3, "description": None, "breed_id": breed_id},
+            headers=users.headers(owner_id),
+        )
+        assert response.status_code == 200
+        return response.json()["id"]
+    return create
+
+
+async def kitty_ages(ids) -> dict:
+    async with async_session() as session:
+        return dict((await session.execute(select(Kitty.id, Kitty.age).filter(Kitty.id.in_(ids)))).all())
+
+
+async def test_bulk_by_ids_reports_each_id(api_client, users, create_kitty):
+    owner, stranger = await users.create(), await users.create()
+    live, deleted = await create_kitty(owner), await create_kitty(owner)
+    foreign = await create_kitty(stranger)
+    assert (await api_client.delete(f"/kitty/soft_removal/{deleted}", headers=users.headers(owner))).status_code == 200
+    missing = 2 ** 31 - 1
+
+    response = await api_client.patch(
+        "/kitty/bulk",
+        json={"ids": [missing, deleted, live, foreign, live], "patch": age_patch(7)},
+        headers=users.headers(owner),
+    )
+
+    # Чужой котенок для владельца не существует; порядок ответа - порядок запроса
+    assert response.json() == {"updated": [live], "not_found": [missing, foreign], "already_deleted": [deleted]}
+    assert await kitty_ages([live, foreign]) == {live: 7, foreign: 3}
+
+
+async def test_bulk_by_filter_walks_all_chunks(api_client, users, create_kitty, monkeypatch):
+    monkeypatch.setattr(get_settings(), "bulk_chunk_size", 2)
+    owner, stranger = await users.create(), await users.create()
+    color = f"c{uuid.uuid4().hex}"
+    matching = [await create_kitty(owner, color) for _ in range(5)]
+    other_color = await create_kitty(owner)
+    foreign = await create_kitty(stranger, color)
+    deleted = await create_kitty(owner, color)
+    assert (await api_client.delete(f"/kitty/soft_removal/{deleted}", headers=users.headers(owner))).status_code == 200
+
+    response = await api_client.patch(
+        "/kitty/bulk", json={"filter": {"color": color}, "patch": age_patch(9)}, headers=users.headers(owner)
+    )
+
+    assert response.json() == {"updated": matching, "not_found": [], "already_deleted": []}
+    ages = await kitty_ages([*matching, other_color, foreign, deleted])
+    assert ages == {**{kitty_id: 9 for kitty_id in matching}, other_color: 3, foreign: 3, deleted: 3}
+
+
+async def test_bulk_delete_by_filter(api_client, users, create_kitty):
+    owner = await users.create()
+    color = f"c{uuid.uuid4().hex}"
+    matching = [await create_kitty(owner, color) for _ in range(3)]
+
+    response = await api_client.request(
+        "DELETE", "/kitty/bulk", json={"filter": {"color": color}}, headers=users.headers(owner)
+    )
+    assert response.json()["updated"] == matching
+
+    again = await api_client.request(
+        "DELETE", "/kitty/bulk", json={"ids": matching}, headers=users.headers(owner)
+    )
+    assert again.json() == {"updated": [], "not_found": [], "already_deleted": matching}
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from core.session import async_session, get_settings
+from database.models import ChangeOutbox
+from src.changes.outbox import START_CURSOR, read_changes
+from src.changes.purge import purge_old_changes
+
+pytestmark = pytest.mark.anyio
+
+
+def change(owner_id: int, entity_id: int, **values) -> ChangeOutbox:
+    return ChangeOutbox(
+        entity="kitty", entity_id=entity_id, owner_id=owner_id, operation="update", payload={}, **values
+    )
+
+
+async def read(owner_id: int, cursor: str = START_CURSOR, limit: int = 100):
+    async with async_session() as session:
+        return await read_changes(session, cursor, limit, owner_id, "kitty")
+
+
+async def test_pages_follow_tx_id_then_seq(users):
+    owner_id = await users.create()
+    # Несколько строк в одной транзакции различаются только seq
+    for entity_ids in ([1, 2], [3], [4, 5, 6]):
+        async with async_session() as session:
+            session.add_all(change(owner_id, entity_id) for entity_id in entity_ids)
+            await session.commit()
+
+    seen, cursors, cursor = [], [], START_CURSOR
+    while True:
+        page = await read(owner_id, cursor, limit=2)
+        if not page.changes:
+            assert page.next_cursor == cursor
+            break
+        assert page.next_cursor == page.changes[-1].cursor
+        seen.extend(item.entity_id for item in page.changes)
+        cursors.extend(item.cursor for item in page.changes)
+        cursor = page.next_cursor
+
+    assert seen == [1, 2, 3, 4, 5, 6]
+    assert len(set(cursors)) == 6
+
+
+async def test_changes_of_open_transaction_hold_back_later_ones(users):
+    owner_id = await users.create()
+    async with async_session() as open_session:
+        # Транзакция получает tx_id первой, но коммитится последней
+        open_session.add(change(owner_id, 1))
+        await open_session.flush()
+
+        async with async_session() as session:
+            session.add(change(owner_id, 2))
+            await session.commit()
+
+        # Строка 2 уже видна в БД, но курсор не должен перескочить через будущую строку 1
+        assert (await read(owner_id)).changes == []
+
+        await open_session.commit()
+
+    assert [item.entity_id for item in (await read(owner_id)).changes] == [1, 2]
+
+
+async def test_purge_removes_changes_older_than_retention(users):
+    owner_id = await users.create()
+    expired_at = datetime.utcnow() - timedelta(days=get_settings().outbox_retention_days, hours=1)
+    async with async_session() as session:
+        session.add_all([change(owner_id, 1, created_at=expired_at), change(owner_id, 2, created_at=expired_at)])
+        session.add(change(owner_id, 3))
+        await session.commit()
+
+    assert await purge_old_changes() >= 2
+
+    async with async_session() as session:
+        remaining = (await session.scalars(
+            select(ChangeOutbox.entity_id).filter(ChangeOutbox.owner_id == owner_id)
+        )).all()
+    assert remaining == [3]
@@ -0,0 +1,85 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.kitty.router import _if_match_allows
+from src.middleware import compression
+from src.middleware.compression import CompressionMiddleware
+
+
+@pytest.mark.parametrize(
+    "if_match, allowed",
+    [
+        (None, True),
+        ("*", True),
+        ('"3"', True),
+        ('"2", "3"', True),
+        ('"2"', False),
+        ('W/"3"', False),
+        ('W/"2", W/"3"', False),
+    ],
+)
+def test_if_match_uses_strong_comparison(if_match, allowed):
+    assert _if_match_allows(if_match, 3) is allowed
+
+
+@pytest.mark.anyio
+async def test_compression_keeps_strong_etag():
+    application = FastAPI()
+
+    @application.get("/versioned")
+    async def versioned():
+        return JSONResponse({"description": "котенок " * 500}, headers={"ETag": '"3"'})
+
+    application.add_middleware(CompressionMiddleware, minimum_size=100)
+    transport = httpx.ASGITransport(app=application)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/versioned", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"3"'
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0.8, gzip;q=0.8", "br"),
+        ("br;q=0, gzip", "gzip"),
+        ("*;q=0.5, gzip;q=0.9", "gzip"),
+        ("*", "br"),
+        ("gzip;q=0, br;q=0", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding_prefers_highest_quality(accept_encoding, expected, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert compression.negotiate_encoding(accept_encoding) == expected
+
+
+def test_negotiate_encoding_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert compression.negotiate_encoding("br, gzip;q=0.5") == "gzip"
+    assert compression.negotiate_encoding("br") is None
+
+
+@pytest.mark.anyio
+async def test_event_stream_is_not_compressed():
+    application = FastAPI()
+
+    @application.get("/events")
+    async def events():
+        async def stream():
+            yield "data: " + "котенок " * 500 + "\n\n"
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    application.add_middleware(CompressionMiddleware, minimum_size=100)
+    transport = httpx.ASGITransport(app=application)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text.startswith("data: котенок")
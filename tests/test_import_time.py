@@ -0,0 +1,23 @@
+from pathlib import Path
+
+from benchmarks.import_time import IMPORT_BUDGET_MS, LAZY_MODULES, measure_median_ms, measure_once
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNS = 5
+
+
+def test_lazy_modules_not_imported_by_main(monkeypatch):
+    # Чистый процесс: в процессе pytest модули уже могли загрузить другие тесты
+    monkeypatch.chdir(ROOT)
+    modules = measure_once("main")
+
+    assert "main" in modules
+    assert [name for name in LAZY_MODULES if name in modules] == []
+
+
+def test_main_import_within_budget(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    # Медиана нескольких запусков, как в бенчмарке: один холодный запуск слишком шумный
+    median_ms, _ = measure_median_ms("main", RUNS)
+
+    assert median_ms < IMPORT_BUDGET_MS
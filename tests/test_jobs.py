@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, update
+
+from core.session import async_session, get_settings
+from database.models import Job, Kitty
+from src.jobs.queue import claim_statement, complete_statement
+from src.jobs.worker import run_next_job
+
+pytestmark = pytest.mark.anyio
+
+# Задачи теста готовы раньше любых других в jobs и забираются первыми
+LONG_AGO = datetime(2000, 1, 1)
+
+
+async def add_job(user_id: int, kind: str = "kitty_unknown", payload: dict = None, **values) -> int:
+    async with async_session() as session:
+        job = Job(
+            kind=kind, payload=payload or {}, max_attempts=3, user_id=user_id, run_after=LONG_AGO, **values
+        )
+        session.add(job)
+        await session.commit()
+        return job.id
+
+
+async def get_job(job_id: int) -> Job:
+    async with async_session() as session:
+        return await session.get(Job, job_id)
+
+
+async def test_concurrent_claims_take_different_jobs(users):
+    user_id = await users.create()
+    job_ids = {await add_job(user_id) for _ in range(3)}
+
+    sessions = [async_session() for _ in range(3)]
+    try:
+        # Все три транзакции открыты одновременно: строки друг друга они пропускают, а не ждут
+        claimed = [(await session.execute(claim_statement())).one().id for session in sessions]
+        for session in sessions:
+            await session.commit()
+    finally:
+        for session in sessions:
+            await session.close()
+
+    assert set(claimed) == job_ids
+
+
+async def test_parallel_claims_never_share_job(users):
+    user_id = await users.create()
+    job_ids = {await add_job(user_id) for _ in range(5)}
+
+    async def claim():
+        async with async_session() as session:
+            claimed = (await session.execute(claim_statement())).one()
+            await session.commit()
+            return claimed.id
+
+    claimed = await asyncio.gather(*(claim() for _ in job_ids))
+    assert sorted(claimed) == sorted(job_ids)
+
+
+async def test_failed_job_retries_with_backoff_then_fails(users, monkeypatch):
+    monkeypatch.setattr(get_settings(), "job_retry_backoff", 60.0)
+    user_id = await users.create()
+    job_id = await add_job(user_id)
+
+    delays = []
+    for attempt in range(1, 4):
+        assert await run_next_job()
+        job = await get_job(job_id)
+        assert job.attempts == attempt
+        assert job.error.startswith("LookupError")
+        if job.status == "queued":
+            delays.append((job.run_after - job.updated_at).total_seconds())
+            # Повтор еще не готов: делаем его готовым, как если бы пауза прошла
+            async with async_session() as session:
+                await session.execute(update(Job).where(Job.id == job_id).values(run_after=LONG_AGO))
+                await session.commit()
+
+    assert job.status == "failed"
+    assert delays == [60.0, 120.0]
+
+
+async def test_stale_running_job_is_claimed_again(users):
+    user_id = await users.create()
+    lock_timeout = timedelta(seconds=get_settings().job_lock_timeout)
+    stale_id = await add_job(
+        user_id, status="running", attempts=1, locked_at=datetime.utcnow() - lock_timeout - timedelta(minutes=1)
+    )
+    await add_job(user_id, status="running", attempts=1, locked_at=datetime.utcnow())
+
+    async with async_session() as session:
+        reclaimed = (await session.execute(claim_statement())).one()
+        await session.commit()
+    assert (reclaimed.id, reclaimed.attempts) == (stale_id, 2)
+
+    # Первый воркер, очнувшись, не может отметить задачу: она уже не его
+    abandoned = SimpleNamespace(id=stale_id, attempts=1)
+    async with async_session() as session:
+        assert (await session.execute(complete_statement(abandoned, {}))).rowcount == 0
+        assert (await session.execute(complete_statement(reclaimed, {}))).rowcount == 1
+        await session.commit()
+    assert (await get_job(stale_id)).status == "done"
+
+
+async def test_job_runs_handler_and_stores_result(users, breed_id):
+    user_id = await users.create()
+    kitty = {"name": "job", "color": "black", "age": 2, "description": None, "breed_id": breed_id}
+    job_id = await add_job(user_id, kind="kitty_import", payload={"kittens": [kitty, kitty]})
+
+    assert await run_next_job()
+
+    job = await get_job(job_id)
+    assert job.status == "done"
+    async with async_session() as session:
+        created = (await session.scalars(
+            select(Kitty.id).filter(Kitty.owner_id == user_id).order_by(Kitty.id)
+        )).all()
+    assert job.result == {"created": created}
+    assert len(created) == 2
@@ -0,0 +1,98 @@
+import uuid
+from contextlib import aclosing
+
+import pytest
+from sqlalchemy import select
+
+from core.notifications import listener
+from core.session import async_session, get_settings
+from database.models import ChangeOutbox
+from src.changes.outbox import make_cursor
+from src.changes.router import _change_events
+
+pytestmark = pytest.mark.anyio
+
+
+async def last_cursor() -> str:
+    async with async_session() as session:
+        row = (await session.execute(
+            select(ChangeOutbox.tx_id, ChangeOutbox.seq).order_by(ChangeOutbox.tx_id.desc(), ChangeOutbox.seq.desc())
+        )).first()
+    return make_cursor(*row) if row else "0-0"
+
+
+@pytest.fixture
+async def kitty(api_client, users, breed_id):
+    """Котенок пользователя owner; stranger - другой пользователь."""
+    owner, stranger = await users.create(), await users.create()
+    since = await last_cursor()
+    word = f"k{uuid.uuid4().hex}"
+    response = await api_client.post(
+        "/kitty/create/",
+        json={"name": word, "color": "black", "age": 3, "description": None, "breed_id": breed_id},
+        headers=users.headers(owner),
+    )
+    assert response.status_code == 200
+    return {"id": response.json()["id"], "word": word, "since": since, "owner": owner, "stranger": stranger}
+
+
+async def test_get_hides_other_owners_kitty(api_client, users, kitty):
+    assert (await api_client.get(f"/kitty/{kitty['id']}", headers=users.headers(kitty["owner"]))).status_code == 200
+    response = await api_client.get(f"/kitty/{kitty['id']}", headers=users.headers(kitty["stranger"]))
+    assert response.status_code == 404
+
+
+async def test_batch_reports_other_owners_kitty_missing(api_client, users, kitty):
+    response = await api_client.get(
+        "/kitty/batch", params={"ids": [kitty["id"]]}, headers=users.headers(kitty["stranger"])
+    )
+    assert response.json() == {"kittens": [], "missing_ids": [kitty["id"]]}
+
+
+async def test_search_finds_only_own_kittens(api_client, users, kitty):
+    own = await api_client.get("/kitty/search", params={"q": kitty["word"]}, headers=users.headers(kitty["owner"]))
+    assert [hit["kitty"]["id"] for hit in own.json()["hits"]] == [kitty["id"]]
+
+    other = await api_client.get(
+        "/kitty/search", params={"q": kitty["word"]}, headers=users.headers(kitty["stranger"])
+    )
+    assert other.json()["hits"] == []
+
+
+async def test_changes_show_only_own_kittens(api_client, users, kitty):
+    own = await api_client.get(
+        "/kitty/changes", params={"since": kitty["since"], "entity": "kitty"}, headers=users.headers(kitty["owner"])
+    )
+    assert [change["entity_id"] for change in own.json()["changes"]] == [kitty["id"]]
+
+    other = await api_client.get(
+        "/kitty/changes",
+        params={"since": kitty["since"], "entity": "kitty"},
+        headers=users.headers(kitty["stranger"]),
+    )
+    assert other.json()["changes"] == []
+
+
+async def test_change_stream_shows_only_own_kittens(kitty, monkeypatch):
+    monkeypatch.setattr(get_settings(), "changes_poll_interval", 0.05)
+    try:
+        async with aclosing(_change_events(kitty["since"], kitty["owner"], "kitty")) as events:
+            assert f'"entity_id":{kitty["id"]}' in await anext(events)
+        async with aclosing(_change_events(kitty["since"], kitty["stranger"], "kitty")) as events:
+            assert await anext(events) == ": keep-alive\n\n"
+    finally:
+        await listener.close()
+
+
+async def test_breed_changes_are_shared(api_client, users, breed_id):
+    """Строки без owner_id (породы) видны всем пользователям."""
+    reader = await users.create()
+    since = await last_cursor()
+    async with async_session() as session:
+        session.add(ChangeOutbox(entity="breed", entity_id=breed_id, operation="update", payload={}))
+        await session.commit()
+
+    response = await api_client.get(
+        "/kitty/changes", params={"since": since, "entity": "breed"}, headers=users.headers(reader)
+    )
+    assert [change["entity_id"] for change in response.json()["changes"]] == [breed_id]
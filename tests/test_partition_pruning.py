@@ -0,0 +1,36 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from benchmarks.partition_pruning import pruning_checks, scanned_partitions
+from core.session import async_session, get_settings
+
+pytestmark = pytest.mark.anyio
+
+NOW = datetime.now()
+CHECKS = pruning_checks(get_settings().kitty_partition_by, NOW)
+
+
+async def test_kittens_is_partitioned(database):
+    async with async_session() as session:
+        partitions = (await session.execute(
+            text("SELECT count(*) FROM pg_inherits WHERE inhparent = 'kittens'::regclass")
+        )).scalar()
+    assert partitions > 1
+
+
+@pytest.mark.parametrize("name", sorted(CHECKS))
+async def test_query_scans_one_partition(database, name):
+    async with async_session() as session:
+        partitions = await scanned_partitions(session, CHECKS[name])
+    assert len(partitions) == 1, f"{name} затрагивает секции: {', '.join(partitions)}"
+
+
+async def test_kitty_ids_are_unique_across_partitions(database):
+    # Первичный ключ включает ключ секционирования, поэтому дубли id он не ловит
+    async with async_session() as session:
+        duplicates = (await session.execute(
+            text("SELECT id FROM kittens GROUP BY id HAVING count(*) > 1 LIMIT 10")
+        )).scalars().all()
+    assert duplicates == []
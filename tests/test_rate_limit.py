@@ -0,0 +1,141 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import fakeredis
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from core.session import get_settings
+from src.dependencies.authentication import get_token_payload
+from src.middleware.rate_limit import MemoryBucketStore, RateLimitMiddleware, RedisBucketStore
+from src.user import auth
+from src.user.schemas import UserTokenPayload
+
+pytestmark = pytest.mark.anyio
+
+RATE_LIMITS = {
+    "GET /limited": {"ip": "2/60"},
+    "GET /per-user": {"user": "1/60"},
+    "GET /both": {"ip": "2/60", "user": "1/60"},
+}
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    if request.param == "memory":
+        return MemoryBucketStore()
+    return RedisBucketStore(fakeredis.FakeAsyncRedis())
+
+
+class SessionCounter:
+    def __init__(self):
+        self.opened = 0
+
+    async def get_db(self):
+        self.opened += 1
+        yield None
+
+
+@pytest.fixture
+def sessions():
+    return SessionCounter()
+
+
+@pytest.fixture
+def client(store, sessions):
+    application = FastAPI()
+
+    @application.get("/limited")
+    async def limited(db_connect=Depends(sessions.get_db)):
+        return {"ok": True}
+
+    @application.get("/per-user")
+    async def per_user(
+            token_payload: UserTokenPayload = Depends(get_token_payload),
+            db_connect=Depends(sessions.get_db),
+    ):
+        return {"user_id": token_payload.user_id}
+
+    @application.get("/both")
+    async def both(token_payload: UserTokenPayload = Depends(get_token_payload)):
+        return {"user_id": token_payload.user_id}
+
+    settings = get_settings().model_copy(update={"rate_limits": RATE_LIMITS})
+    application.add_middleware(RateLimitMiddleware, store=store, settings=settings)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=application), base_url="http://test")
+
+
+def bearer(user_id: int) -> dict:
+    token = auth.encode_token({"exp": datetime.utcnow() + timedelta(minutes=5), "user_id": user_id}, get_settings())
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def test_bucket_denies_when_empty_and_refills(store):
+    assert await store.take("bucket", 2, 20.0) == 0
+    assert await store.take("bucket", 2, 20.0) == 0
+
+    retry_after = await store.take("bucket", 2, 20.0)
+    assert 0 < retry_after <= 0.05 + 1e-3
+
+    await asyncio.sleep(0.1)
+    assert await store.take("bucket", 2, 20.0) == 0
+
+
+async def test_buckets_are_independent(store):
+    assert await store.take("first", 1, 0.01) == 0
+    assert await store.take("first", 1, 0.01) > 0
+    assert await store.take("second", 1, 0.01) == 0
+
+
+async def test_rejected_take_leaves_other_buckets(store):
+    assert await store.take("user", 1, 0.01) == 0
+    assert await store.take_all([("ip", 1, 0.01), ("user", 1, 0.01)]) > 0
+    assert await store.take("ip", 1, 0.01) == 0
+
+
+async def test_429_with_retry_after_before_db_session(client, sessions):
+    async with client:
+        for _ in range(2):
+            assert (await client.get("/limited")).status_code == 200
+        response = await client.get("/limited")
+
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Слишком много запросов"}
+    # 1 токен за 30 секунд: ждать почти все 30 секунд
+    assert 29 <= int(response.headers["retry-after"]) <= 30
+    assert sessions.opened == 2
+
+
+async def test_user_limit_is_per_user(client, sessions):
+    async with client:
+        assert (await client.get("/per-user", headers=bearer(1))).status_code == 200
+        assert (await client.get("/per-user", headers=bearer(1))).status_code == 429
+        assert (await client.get("/per-user", headers=bearer(2))).status_code == 200
+    assert sessions.opened == 2
+
+
+async def test_token_is_decoded_once_per_request(client, monkeypatch):
+    calls = []
+    decode_token = auth.decode_token
+
+    def counting_decode_token(token, settings):
+        calls.append(token)
+        return decode_token(token, settings)
+
+    monkeypatch.setattr(auth, "decode_token", counting_decode_token)
+    async with client:
+        response = await client.get("/per-user", headers=bearer(7))
+
+    assert response.json() == {"user_id": 7}
+    assert len(calls) == 1
+
+
+async def test_user_rejection_does_not_drain_ip_bucket(client):
+    async with client:
+        assert (await client.get("/both", headers=bearer(1))).status_code == 200
+        for _ in range(3):
+            assert (await client.get("/both", headers=bearer(1))).status_code == 429
+        # Отказы пользователю 1 не тратили токены IP: второй токен достается пользователю 2
+        assert (await client.get("/both", headers=bearer(2))).status_code == 200
+        assert (await client.get("/both", headers=bearer(3))).status_code == 429
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from core.session import async_session, get_settings
+from database.models import RefreshToken, User
+from src.user.auth import create_access_token, decode_token, issue_refresh_token
+from src.user.token_purge import purge_expired_tokens
+
+pytestmark = pytest.mark.anyio
+
+
+async def issue(user_id: int, expires_delta: timedelta = None) -> str:
+    async with async_session() as session:
+        token = issue_refresh_token(session, user_id, get_settings(), expires_delta)
+        await session.commit()
+    return token
+
+
+async def update_token(token: str, **values):
+    jti = decode_token(token, get_settings())["jti"]
+    async with async_session() as session:
+        await session.execute(update(RefreshToken).where(RefreshToken.jti == jti).values(**values))
+        await session.commit()
+
+
+async def refresh(api_client, token: str):
+    return await api_client.post("/user/refresh", params={"refresh_token": token})
+
+
+async def test_refresh_rotates_token(api_client, users):
+    user_id = await users.create()
+    token = await issue(user_id)
+
+    response = await refresh(api_client, token)
+    assert response.status_code == 200
+    rotated = response.json()["refresh_token"]
+    assert response.json()["user_id"] == user_id
+    assert rotated != token
+
+    # Повторное использование отозванного токена - отказ, новый токен работает
+    assert (await refresh(api_client, token)).status_code == 401
+    assert (await refresh(api_client, rotated)).status_code == 200
+
+
+async def test_access_token_is_not_refresh_token(api_client, users):
+    user_id = await users.create()
+    access_token = create_access_token(user_id, settings=get_settings())
+
+    assert (await refresh(api_client, access_token)).status_code == 401
+
+
+async def test_expired_token_is_rejected(api_client, users):
+    user_id = await users.create()
+
+    assert (await refresh(api_client, await issue(user_id, timedelta(seconds=-1)))).status_code == 401
+
+    # Подпись еще действительна, но запись в refresh_tokens уже истекла
+    token = await issue(user_id)
+    await update_token(token, expires_at=datetime.utcnow() - timedelta(minutes=1))
+    assert (await refresh(api_client, token)).status_code == 401
+
+
+async def test_revoked_token_is_rejected(api_client, users):
+    user_id = await users.create()
+    token = await issue(user_id)
+    await update_token(token, revoked_at=datetime.utcnow())
+
+    assert (await refresh(api_client, token)).status_code == 401
+
+
+async def test_archived_user_cannot_refresh(api_client, users):
+    user_id = await users.create()
+    token = await issue(user_id)
+    async with async_session() as session:
+        await session.execute(update(User).where(User.id == user_id).values(deleted_at=datetime.utcnow()))
+        await session.commit()
+
+    assert (await refresh(api_client, token)).status_code == 401
+
+
+async def test_purge_removes_only_expired_tokens(users):
+    user_id = await users.create()
+    live = decode_token(await issue(user_id), get_settings())["jti"]
+    expired = []
+    for _ in range(3):
+        token = await issue(user_id)
+        await update_token(token, expires_at=datetime.utcnow() - timedelta(days=1))
+        expired.append(decode_token(token, get_settings())["jti"])
+
+    assert await purge_expired_tokens() >= len(expired)
+
+    async with async_session() as session:
+        remaining = (await session.scalars(
+            select(RefreshToken.jti).filter(RefreshToken.user_id == user_id)
+        )).all()
+    assert remaining == [live]
@@ -0,0 +1,64 @@
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def search(api_client, users, breed_id):
+    """Котята пользователя со словом word: в описании оно повторяется разное число раз."""
+    owner = await users.create()
+    word = f"k{uuid.uuid4().hex}"
+
+    async def create(repeats: int) -> int:
+        response = await api_client.post(
+            "/kitty/create/",
+            json={
+                "name": word, "color": "black", "age": 3, "description": " ".join([word] * repeats) or None,
+                "breed_id": breed_id,
+            },
+            headers=users.headers(owner),
+        )
+        return response.json()["id"]
+
+    async def page(cursor: str = None, limit: int = 2):
+        params = {"q": word, "limit": limit} | ({"cursor": cursor} if cursor else {})
+        return await api_client.get("/kitty/search", params=params, headers=users.headers(owner))
+
+    # Одинаковые описания дают одинаковый rank: порядок среди них держится на id
+    ids = [await create(repeats) for repeats in (1, 0, 1, 2, 1, 2, 3)]
+    return {"ids": ids, "create": create, "page": page}
+
+
+async def test_search_cursor_pages_without_gaps_or_duplicates(search):
+    hits, cursor = [], None
+    while True:
+        response = await search["page"](cursor)
+        assert response.status_code == 200
+        hits.extend(response.json()["hits"])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+
+    found = [(hit["rank"], hit["kitty"]["id"]) for hit in hits]
+    assert sorted(kitty_id for _, kitty_id in found) == sorted(search["ids"])
+    assert found == sorted(found, reverse=True)
+    assert "<mark>" in hits[0]["name_highlight"]
+
+
+async def test_search_page_boundary_is_stable(search):
+    first = (await search["page"]()).json()
+    # Новый котенок с наибольшим rank попадает в начало выдачи, а не сдвигает следующие страницы
+    await search["create"](5)
+    rest = (await search["page"](first["next_cursor"], limit=100)).json()
+
+    first_ids = [hit["kitty"]["id"] for hit in first["hits"]]
+    rest_ids = [hit["kitty"]["id"] for hit in rest["hits"]]
+    assert sorted(first_ids + rest_ids) == sorted(search["ids"])
+    assert rest["next_cursor"] is None
+
+
+async def test_search_rejects_malformed_cursor(search):
+    assert (await search["page"]("1.2.3:1")).status_code == 400
+    assert (await search["page"]("rank:1")).status_code == 422
@@ -0,0 +1,64 @@
+import json
+import logging
+from typing import List
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from pydantic import BaseModel, TypeAdapter
+
+from src.streaming import json_list_response
+
+pytestmark = pytest.mark.anyio
+
+
+class Item(BaseModel):
+    id: int
+
+
+ITEMS_ADAPTER = TypeAdapter(List[Item])
+
+
+async def partitions(fail_after: int = None):
+    for number in range(3):
+        if number == fail_after:
+            raise RuntimeError("соединение с БД потеряно")
+        yield [Item(id=number * 2), Item(id=number * 2 + 1)]
+
+
+def client_for(fail_after: int = None) -> httpx.AsyncClient:
+    application = FastAPI()
+
+    @application.get("/items")
+    async def items():
+        return await json_list_response("items", partitions(fail_after), ITEMS_ADAPTER)
+
+    transport = httpx.ASGITransport(app=application, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+async def test_streams_valid_json():
+    async with client_for() as client:
+        response = await client.get("/items")
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [{"id": number} for number in range(6)]}
+
+
+async def test_error_before_first_partition_is_500():
+    async with client_for(fail_after=0) as client:
+        response = await client.get("/items")
+
+    assert response.status_code == 500
+
+
+async def test_error_mid_stream_is_logged_and_truncated(caplog):
+    with caplog.at_level(logging.ERROR, logger="src.streaming"):
+        async with client_for(fail_after=1) as client:
+            response = await client.get("/items")
+
+    assert response.status_code == 200
+    assert response.content == b'{"items":[{"id":0},{"id":1}'
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(response.content)
+    assert "оборван" in caplog.text
@@ -0,0 +1,86 @@
+import fastapi.routing
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from core import tracing
+from core.session import get_settings
+from src.api import api_router
+from src.middleware.tracing import TracingMiddleware
+
+pytest.importorskip("opentelemetry.sdk")
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def exporter():
+    settings = get_settings().model_copy(
+        update={"tracing_enabled": True, "tracing_exporter": "memory", "tracing_sample_ratio": 1.0}
+    )
+    tracing.setup_tracing(settings)
+    yield tracing.exporter
+    tracing.shutdown_tracing()
+
+
+@pytest.fixture
+async def traced_client(database, exporter):
+    application = FastAPI()
+    application.include_router(api_router)
+    application.add_middleware(TracingMiddleware)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=application), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def kitty(traced_client, exporter, users, breed_id):
+    owner = await users.create()
+    response = await traced_client.post(
+        "/kitty/create/",
+        json={"name": "traced", "color": "black", "age": 3, "description": None, "breed_id": breed_id},
+        headers=users.headers(owner),
+    )
+    exporter.clear()
+    return {"id": response.json()["id"], "headers": users.headers(owner)}
+
+
+def span_tree(exporter):
+    """Корневой спан запроса и имена его прямых потомков."""
+    spans = exporter.get_finished_spans()
+    roots = [span for span in spans if span.parent is None]
+    assert len(roots) == 1
+    root = roots[0]
+    assert {span.context.trace_id for span in spans} == {root.context.trace_id}
+    children = [span.name for span in spans if span.parent is not None and span.parent.span_id == root.context.span_id]
+    return root, children
+
+
+async def test_request_span_tree(traced_client, exporter, kitty):
+    response = await traced_client.get(f"/kitty/{kitty['id']}", headers=kitty["headers"])
+    assert response.status_code == 200
+
+    root, children = span_tree(exporter)
+    assert root.name == "GET /kitty/{kitty_id}"
+    assert root.attributes["http.response.status_code"] == 200
+    assert {"auth.token", "db.session", "db.checkout", "SELECT", "db.commit", "response.serialize"} <= set(children)
+
+
+async def test_streamed_list_has_session_span(traced_client, exporter, kitty):
+    response = await traced_client.get("/kitty/all/", headers=kitty["headers"])
+    assert [item["id"] for item in response.json()["kittens"]] == [kitty["id"]]
+
+    root, children = span_tree(exporter)
+    assert root.name == "GET /kitty/all/"
+    assert {"auth.token", "db.session", "SELECT", "response.serialize"} <= set(children)
+
+
+def test_shutdown_restores_serialization():
+    original = fastapi.routing.serialize_response
+    settings = get_settings().model_copy(update={"tracing_enabled": True, "tracing_exporter": "memory"})
+
+    tracing.setup_tracing(settings)
+    assert fastapi.routing.serialize_response is not original
+    tracing.shutdown_tracing()
+
+    assert fastapi.routing.serialize_response is original
+    assert not tracing.is_enabled()